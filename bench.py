@@ -0,0 +1,175 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tibble import Pipeline, Tibble, read_csv
+
+HEAVY_MODULES = ["torch", "plotnine", "scipy"]
+
+
+def time_import(stmt, repeat=5):
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{stmt}\n"
+        "print(time.perf_counter() - t)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    times, loaded = [], ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return statistics.median(times), loaded
+
+
+print("\n" + "=" * 45 + "\n[Import time]")
+base, _ = time_import("import pandas")
+total, loaded = time_import("import tibble")
+print(f"import pandas: {base * 1000:8.1f} ms")
+print(f"import tibble: {total * 1000:8.1f} ms (+{(total - base) * 1000:.1f} ms)")
+print(f"heavy modules loaded: {loaded or 'none'}")
+assert not loaded, f"`import tibble` eagerly imports {loaded}"
+
+
+print("\n" + "=" * 45 + "\n[Multi-file read_csv]")
+with tempfile.TemporaryDirectory() as tmp:
+    rng = np.random.default_rng(0)
+    for i in range(16):
+        pd.DataFrame(
+            {
+                "id": rng.integers(0, 10_000, 100_000),
+                "value": rng.normal(size=100_000),
+                "category": rng.choice(["A", "B", "C"], 100_000),
+            }
+        ).to_csv(os.path.join(tmp, f"shard-{i:02d}.csv"), index=False)
+    size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1e6
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        t = time.perf_counter()
+        read_csv(os.path.join(tmp, "*.csv"), max_workers=workers, source="file")
+        elapsed = time.perf_counter() - t
+        print(f"{workers:3d} workers: {elapsed:6.2f} s  {size_mb / elapsed:7.1f} MB/s")
+
+
+print("\n" + "=" * 45 + "\n[Chunked to_csv]")
+with tempfile.TemporaryDirectory() as tmp:
+    rng = np.random.default_rng(0)
+    n = 2_000_000
+    frame = pd.DataFrame(
+        {
+            "id": rng.integers(0, 10_000, n),
+            "value": rng.normal(size=n),
+            "category": rng.choice(["A", "B", "C"], n),
+            "ts": pd.date_range("2024-01-01", periods=n, freq="s"),
+        }
+    )
+    tbl = Tibble(frame)
+
+    plain = os.path.join(tmp, "pandas.csv")
+    t = time.perf_counter()
+    frame.to_csv(plain, index=False)
+    elapsed = time.perf_counter() - t
+    size_mb = os.path.getsize(plain) / 1e6
+    print(f"pandas to_csv         : {elapsed:6.2f} s  {size_mb / elapsed:7.1f} MB/s")
+
+    for suffix in [".csv", ".csv.gz"]:
+        for workers in sorted({1, os.cpu_count() or 1}):
+            t = time.perf_counter()
+            tbl.to_csv(os.path.join(tmp, f"out{suffix}"), max_workers=workers)
+            elapsed = time.perf_counter() - t
+            print(
+                f"{suffix:7s} {workers:3d} workers   : {elapsed:6.2f} s  "
+                f"{size_mb / elapsed:7.1f} MB/s (uncompressed)"
+            )
+
+
+print("\n" + "=" * 45 + "\n[Streaming pipeline]")
+rng = np.random.default_rng(0)
+users = Tibble({"user": np.arange(1000), "country": rng.choice(["us", "de"], 1000)})
+start = pd.Timestamp("2024-01-01")
+events = [
+    pd.DataFrame(
+        {
+            "user": rng.integers(0, 1000, 500),
+            "amount": rng.normal(10, 5, 500),
+            "ts": start + pd.to_timedelta(i + np.sort(rng.random(500)), unit="s"),
+        }
+    )
+    for i in range(1000)
+]
+
+
+async def producer():
+    # In-process stand-in for a queue consumer
+    for batch in events:
+        await asyncio.sleep(0)
+        yield batch
+
+
+async def drain(pipe):
+    return [out async for out in pipe.run_async(producer())]
+
+
+def chain():
+    return (
+        Pipeline()
+        .filter("$amount > 0")
+        .mutate(fee="$amount * 0.01")
+        .join_left(users, on="user")
+        .window("ts", "1min", groupby="country", total="sum($amount)")
+    )
+
+
+t = time.perf_counter()
+for batch in events:
+    (
+        Tibble(batch)
+        .filter("$amount > 0")
+        .mutate(fee="$amount * 0.01")
+        .join_left(users, on="user")
+        .summarize(groupby="country", total="sum($amount)")
+    )
+elapsed = time.perf_counter() - t
+print(f"per-batch verbs   : {len(events) / elapsed:8.0f} batches/s")
+
+t = time.perf_counter()
+list(chain().run(events))
+elapsed = time.perf_counter() - t
+print(f"Pipeline.run      : {len(events) / elapsed:8.0f} batches/s")
+
+t = time.perf_counter()
+asyncio.run(drain(chain()))
+elapsed = time.perf_counter() - t
+print(f"Pipeline.run_async: {len(events) / elapsed:8.0f} batches/s")
+
+
+print("\n" + "=" * 45 + "\n[Wide-table column verbs]")
+
+wide = Tibble._wrap(
+    pd.DataFrame(np.zeros((100, 10_000)), columns=[f"c{i}" for i in range(10_000)])
+)
+keep = [f"c{i}" for i in range(0, 10_000, 2)]
+
+t = time.perf_counter()
+for _ in range(20):
+    wide.select(keep).drop("c0").rename(z="c2").mutate(y="$c4 + 1").filter("$y > 0")
+elapsed = (time.perf_counter() - t) / 20
+print(f"select/drop/rename/mutate/filter: {elapsed * 1000:6.1f} ms")
+
+t = time.perf_counter()
+try:
+    # The unknown column is reported before the first 10k-column batch runs
+    list(Pipeline().mutate(y="$c4 + 1").filter("$nope > 0").run([wide] * 20))
+except KeyError:
+    pass
+print(f"pipeline type check failure     : {(time.perf_counter() - t) * 1000:6.1f} ms")
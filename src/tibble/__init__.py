@@ -1,13 +1,57 @@
 from .tibble import Tibble  # noqa: F401
 from .input import read_csv
-from .public import concat, lead, lag, isin, notin, isna, notna
+from .incremental import IncrementalSummary
+from .cache import VerbCache, pure, set_cache
+from .partition import PartitionedTibble
+from .schema import Schema
+from .shared import SharedTibble
+from .stream import Pipeline
+from .sketches import (
+  HyperLogLog,
+  TDigest,
+  approx_distinct,
+  approx_median,
+  approx_quantile,
+)
+from .public import (
+  concat,
+  table,
+  distinct,
+  count,
+  slice_sample,
+  to_csv,
+  lead,
+  lag,
+  isin,
+  notin,
+  isna,
+  notna,
+)
 
 from pandas import qcut, cut
 
 __all__ = [
   "Tibble",
+  "IncrementalSummary",
+  "VerbCache",
+  "PartitionedTibble",
+  "Schema",
+  "SharedTibble",
+  "Pipeline",
+  "HyperLogLog",
+  "TDigest",
+  "approx_distinct",
+  "approx_median",
+  "approx_quantile",
+  "pure",
+  "set_cache",
   "read_csv",
   "concat",
+  "table",
+  "distinct",
+  "count",
+  "slice_sample",
+  "to_csv",
   "lead",
   "lag",
   "isin",
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import types
+from collections import OrderedDict
+from glob import glob
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+
+_active: "VerbCache | None" = None
+# Library functions used inside expressions are stable across calls
+_STABLE_MODULES = {"builtins", "math", "statistics", "numpy", "pandas", "scipy"}
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def pure(fn: Callable) -> Callable:
+    """Mark a callable as deterministic so verb calls using it can be cached."""
+    fn._tibble_pure = True
+    return fn
+
+
+def set_cache(cache: "VerbCache | None") -> "VerbCache | None":
+    global _active
+    previous, _active = _active, cache
+    return previous
+
+
+def get_cache() -> "VerbCache | None":
+    return _active
+
+
+def fingerprint(obj: Any) -> str:
+    """Content hash of a Tibble or DataFrame; reused from the Tibble if known."""
+    known = getattr(obj, "_fingerprint", None)
+    if known is not None:
+        return known
+
+    df = obj._df if hasattr(obj, "_df") else obj
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    try:
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    except TypeError as e:
+        raise _Uncacheable(str(e)) from e
+    digest = h.hexdigest()
+
+    if hasattr(obj, "_df"):
+        obj._fingerprint = digest
+    return digest
+
+
+def _code_token(code) -> tuple:
+    return (
+        code.co_code,
+        code.co_names,
+        tuple(
+            _code_token(c) if hasattr(c, "co_code") else repr(c) for c in code.co_consts
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _expr_names(expr: str) -> tuple:
+    # Free names of a string expression, which compile_expr resolves from
+    # the caller's globals at call time
+    try:
+        tree = ast.parse(utils.rewrite_expr(expr), mode="eval")
+    except SyntaxError:
+        return ()
+    names = (n.id for n in ast.walk(tree) if isinstance(n, ast.Name))
+    return tuple(dict.fromkeys(n for n in names if n != "d"))
+
+
+def _global_token(value: Any) -> Any:
+    if isinstance(value, types.ModuleType):
+        return ("module", value.__name__)
+    module = getattr(value, "__module__", None) or ""
+    if callable(value) and module.partition(".")[0] in _STABLE_MODULES:
+        return ("callable", module, getattr(value, "__qualname__", repr(value)))
+    return _token(value)
+
+
+def _token(obj: Any, files: bool = False, env: dict | None = None) -> Any:
+    if obj is None or isinstance(obj, (bool, int, float, complex, bytes)):
+        return obj
+    if isinstance(obj, str) and env is not None and not files:
+        names = [n for n in _expr_names(obj) if n in env]
+        if names:
+            return ("expr", obj) + tuple((n, _global_token(env[n])) for n in names)
+        return obj
+    if isinstance(obj, (str, os.PathLike)):
+        path = os.fspath(obj)
+        if files and utils.is_glob(path):
+            return ("glob", path) + tuple(_token(p, files) for p in sorted(glob(path)))
+        if files and os.path.isfile(path):
+            st = os.stat(path)
+            return ("file", os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        return path
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__,) + tuple(_token(x, files, env) for x in obj)
+    if isinstance(obj, dict):
+        return ("dict",) + tuple(
+            (_token(k), _token(v, files, env)) for k, v in obj.items()
+        )
+    if isinstance(obj, pd.DataFrame) or hasattr(obj, "_df"):
+        return ("frame", fingerprint(obj))
+    if isinstance(obj, (pd.Series, pd.Index, np.ndarray)):
+        return ("array", fingerprint(pd.DataFrame({"_": np.asarray(obj)})))
+    if callable(obj):
+        if not getattr(obj, "_tibble_pure", False):
+            raise _Uncacheable(f"{obj!r} is not marked pure")
+        code = getattr(obj, "__code__", None)
+        if code is None:
+            return ("callable", obj.__module__, obj.__qualname__)
+        cells = tuple(c.cell_contents for c in obj.__closure__ or ())
+        return (
+            "callable",
+            obj.__module__,
+            obj.__qualname__,
+            _code_token(code),
+            _token(obj.__defaults__),
+            _token(cells),
+        )
+    raise _Uncacheable(f"cannot fingerprint argument of type {type(obj)}")
+
+
+class VerbCache:
+    """
+    Opt-in result cache for deterministic verbs. Entries are keyed by the
+    content fingerprint of the input Tibble(s) plus the verb name and its
+    arguments. String expressions hash together with the current values of
+    the globals they use; callables are only cached when marked with `pure`.
+    Results live in an in-memory LRU and, when `path` is given, in an
+    on-disk tier capped at `max_disk_bytes`.
+
+        with VerbCache(path=".tibble-cache"):
+            df.filter("$x > 0").summarize(mu="mean($x)", groupby="g")
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        path: str | os.PathLike | None = None,
+        max_disk_bytes: int = 1 << 30,
+    ):
+        self.max_entries = max_entries
+        self.path = None if path is None else os.fspath(path)
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: OrderedDict[str, tuple[type, pd.DataFrame]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._previous: list[VerbCache | None] = []
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+        self._disk_bytes = 0
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def __enter__(self) -> "VerbCache":
+        self._previous.append(set_cache(self))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        set_cache(self._previous.pop())
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __repr__(self) -> str:
+        return f"VerbCache({self.stats()})"
+
+    # ---------- Inspection ----------
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self.path is not None:
+                for file, _, _ in self._disk_entries():
+                    os.remove(file)
+                self._disk_bytes = 0
+
+    # ---------- Memory tier ----------
+
+    def _get(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self._put_memory(key, entry)
+            return entry
+
+        self.misses += 1
+        return None
+
+    def _put_memory(self, key: str, entry) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ---------- Disk tier ----------
+
+    def _disk_entries(self) -> list[tuple[str, float, int]]:
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".pkl"):
+                file = os.path.join(self.path, name)
+                st = os.stat(file)
+                entries.append((file, st.st_mtime, st.st_size))
+        return entries
+
+    def _disk_get(self, key: str):
+        if self.path is None:
+            return None
+
+        file = os.path.join(self.path, f"{key}.pkl")
+        try:
+            with open(file, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        os.utime(file)  # mtime doubles as LRU recency for eviction
+        return entry
+
+    def _disk_put(self, key: str, entry) -> None:
+        if self.path is None:
+            return
+
+        file = os.path.join(self.path, f"{key}.pkl")
+        tmp = f"{file}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        size = os.path.getsize(tmp)
+        if size > self.max_disk_bytes:
+            os.remove(tmp)
+            return
+        os.replace(tmp, file)
+
+        with self._lock:
+            self._disk_bytes += size
+            if self._disk_bytes > self.max_disk_bytes:
+                entries = sorted(self._disk_entries(), key=lambda e: e[1])
+                self._disk_bytes = sum(e[2] for e in entries)
+                for old, _, old_size in entries:
+                    if self._disk_bytes <= self.max_disk_bytes:
+                        break
+                    if old != file:
+                        os.remove(old)
+                        self._disk_bytes -= old_size
+
+    # ---------- Verb dispatch ----------
+
+    def call(self, verb: str, fn: Callable, args, kwargs, files: bool = False):
+        env = utils.caller_globals() or {}
+        try:
+            token = (verb, _token(args, files, env), _token(kwargs, files, env))
+        except _Uncacheable:
+            self.skipped += 1
+            return fn(*args, **kwargs)
+
+        key = hashlib.blake2b(repr(token).encode(), digest_size=16).hexdigest()
+        entry = self._get(key)
+        if entry is None:
+            result = fn(*args, **kwargs)
+            entry = (type(result), result._df.copy())
+            self._put_memory(key, entry)
+            self._disk_put(key, entry)
+        else:
+            cls, df = entry
+            result = cls(df)
+
+        # Identical inputs and verb give identical output, so the key
+        # fingerprints the result and chained calls skip rehashing it
+        result._fingerprint = key
+        return result
+
+
+def memoized(verb: str, files: bool = False) -> Callable:
+    """Route calls through the active VerbCache, if any."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            return _active.call(verb, fn, args, kwargs, files=files)
+
+        return wrapper
+
+    return decorator
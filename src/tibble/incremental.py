@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import ast
+import copy
+import os
+import pickle
+import re
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sketches import HyperLogLog, TDigest
+from .tibble import Tibble
+
+_METRIC_RE = re.compile(
+    r"^\s*(?:np\.|numpy\.)?(\w+)\(\s*(?:\$([A-Za-z_]\w*))?\s*(?:,(.*))?\)\s*$"
+)
+
+_ALIASES = {"len": "n", "size": "n", "average": "mean", "variance": "var"}
+
+# Per-group running statistics each decomposable metric is finalized from.
+_NEEDS = {
+    "n": (),
+    "count": ("count",),
+    "sum": ("sum",),
+    "mean": ("count", "sum"),
+    "min": ("min",),
+    "max": ("max",),
+    "var": ("count", "sum", "m2"),
+    "std": ("count", "sum", "m2"),
+}
+
+# Approximate metrics keep one mergeable sketch per group instead; the
+# sketch parameter is read from the metric's positional arguments.
+_SKETCHES = {
+    "approx_distinct": (HyperLogLog, 0, 14),
+    "approx_quantile": (TDigest, 1, 200),
+    "approx_median": (TDigest, 0, 200),
+}
+
+
+class _Missing:
+    """
+    Stand-in for a missing group-key component. NaN never equals itself and
+    hashes by identity, so raw NaN keys would split one group into several
+    slots across batches, merges and reloads.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Missing)
+
+    def __hash__(self) -> int:
+        return hash(_Missing)
+
+    def __repr__(self) -> str:
+        return "NA"
+
+    def __reduce__(self):
+        return "_MISSING"  # unpickles as the module-level singleton
+
+
+_MISSING = _Missing()
+
+
+def _normalize_key(key: tuple) -> tuple:
+    return tuple(_MISSING if _is_missing(v) else v for v in key)
+
+
+def _is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _sketch_key(col: str, fn: str, args: tuple) -> tuple:
+    kind, position, default = _SKETCHES[fn]
+    param = args[position] if len(args) > position else default
+    return (col, kind.__name__, param)
+
+
+def parse_metric(name: str, spec: Any) -> tuple[str | None, str, tuple]:
+    if isinstance(spec, str):
+        match = _METRIC_RE.match(spec)
+        if match is None:
+            raise ValueError(
+                f"metric {name!r}: cannot parse {spec!r}, expected e.g. 'mean($col)'"
+            )
+        fn, col, rest = match.groups()
+        try:
+            args = ast.literal_eval(f"({rest},)") if rest else ()
+        except (ValueError, SyntaxError) as e:
+            raise ValueError(
+                f"metric {name!r}: arguments must be literals, got {rest!r}"
+            ) from e
+    elif isinstance(spec, tuple) and len(spec) >= 2:
+        col, fn, *args = spec
+        args = tuple(args)
+    else:
+        raise TypeError(
+            f"metric {name!r}: expected a 'fn($col)' string or (col, fn) tuple, "
+            f"got {type(spec)}"
+        )
+
+    fn = _ALIASES.get(fn, fn)
+    if fn not in _NEEDS and fn not in _SKETCHES:
+        raise ValueError(
+            f"metric {name!r}: {fn!r} is not decomposable; "
+            f"supported: {sorted(_NEEDS) + sorted(_SKETCHES)}"
+        )
+    if fn in _NEEDS and args:
+        raise ValueError(f"metric {name!r}: {fn!r} takes no extra arguments")
+    if fn != "n" and col is None:
+        raise ValueError(f"metric {name!r}: {fn!r} requires a column")
+
+    return (None if fn == "n" else col), fn, args
+
+
+class IncrementalSummary:
+    """
+    Append-only grouped summary. Each call to `append` folds a batch into
+    per-group running statistics (count, sum, M2, min, max) in time
+    proportional to the batch, so `summary()` never rescans history.
+
+        inc = IncrementalSummary(groupby="category", mu="mean($value1)")
+        inc.append(batch1).append(batch2)
+        inc.summary()
+    """
+
+    def __init__(
+        self,
+        groupby: str | Sequence[str] | None = None,
+        ddof: int = 1,
+        **metrics: Any,
+    ):
+        if not metrics:
+            raise TypeError("IncrementalSummary requires at least one metric")
+
+        if groupby is None:
+            self.group_cols = []
+        elif isinstance(groupby, str):
+            self.group_cols = [groupby]
+        else:
+            self.group_cols = list(groupby)
+
+        self.ddof = ddof
+        self.metrics = {
+            name: parse_metric(name, spec) for name, spec in metrics.items()
+        }
+
+        self._stat_keys = sorted(
+            {
+                (col, stat)
+                for col, fn, _ in self.metrics.values()
+                for stat in _NEEDS.get(fn, ())
+            }
+        )
+        self._index: dict[tuple, int] = {}
+        self._keys: list[tuple] = []
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._stats = {key: self._blank(key[1], 0) for key in self._stat_keys}
+        self._sketches = {
+            _sketch_key(col, fn, args): []
+            for col, fn, args in self.metrics.values()
+            if fn in _SKETCHES
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return (
+            f"IncrementalSummary(groupby={self.group_cols}, "
+            f"metrics={list(self.metrics)}, groups={len(self)})"
+        )
+
+    # ---------- State management ----------
+
+    @staticmethod
+    def _blank(stat: str, size: int) -> np.ndarray:
+        fill = np.nan if stat in ("min", "max") else 0.0
+        return np.full(size, fill, dtype=np.float64)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._rows)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity, 16)
+        rows = np.zeros(capacity, dtype=np.int64)
+        rows[: len(self._rows)] = self._rows
+        self._rows = rows
+
+        for key, old in self._stats.items():
+            new = self._blank(key[1], capacity)
+            new[: len(old)] = old
+            self._stats[key] = new
+
+        for sketches in self._sketches.values():
+            sketches.extend([None] * (capacity - len(sketches)))
+
+    def _slots(self, keys: Sequence[tuple]) -> np.ndarray:
+        slots = np.empty(len(keys), dtype=np.intp)
+        for i, key in enumerate(keys):
+            key = _normalize_key(key)
+            slot = self._index.get(key)
+            if slot is None:
+                slot = len(self._keys)
+                self._index[key] = slot
+                self._keys.append(key)
+            slots[i] = slot
+
+        self._reserve(len(self._keys))
+        return slots
+
+    def _absorb(self, keys, rows: np.ndarray, stats: dict, sketches: dict) -> None:
+        slots = self._slots(keys)
+        self._rows[slots] += rows
+
+        for key, batch in sketches.items():
+            state = self._sketches[key]
+            for slot, sketch in zip(slots, batch):
+                if state[slot] is None:
+                    state[slot] = sketch
+                else:
+                    state[slot].merge(sketch)
+
+        # Chan et al. pairwise update; `sum` and `count` are read before update
+        for col in {col for col, stat in self._stat_keys if stat == "m2"}:
+            n_a = self._stats[(col, "count")][slots]
+            n_b = stats[(col, "count")]
+            s_a = self._stats[(col, "sum")][slots]
+            s_b = stats[(col, "sum")]
+            m2 = self._stats[(col, "m2")][slots] + stats[(col, "m2")]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = s_b / n_b - s_a / n_a
+                extra = delta**2 * n_a * n_b / (n_a + n_b)
+            self._stats[(col, "m2")][slots] = np.where(
+                (n_a > 0) & (n_b > 0), m2 + extra, m2
+            )
+
+        for col, stat in self._stat_keys:
+            if stat in ("count", "sum"):
+                self._stats[(col, stat)][slots] += stats[(col, stat)]
+            elif stat == "min":
+                self._stats[(col, stat)][slots] = np.fmin(
+                    self._stats[(col, stat)][slots], stats[(col, stat)]
+                )
+            elif stat == "max":
+                self._stats[(col, stat)][slots] = np.fmax(
+                    self._stats[(col, stat)][slots], stats[(col, stat)]
+                )
+
+    # ---------- Public API ----------
+
+    def append(self, batch: Tibble | pd.DataFrame) -> "IncrementalSummary":
+        df = batch._df if isinstance(batch, Tibble) else batch
+
+        value_cols = sorted(
+            {col for col, _ in self._stat_keys} | {key[0] for key in self._sketches}
+        )
+        missing = [c for c in self.group_cols + value_cols if c not in df.columns]
+        if missing:
+            raise KeyError(f"IncrementalSummary: columns not found: {missing}")
+
+        if len(df) == 0:
+            return self
+
+        if self.group_cols:
+            grouped = df.groupby(
+                self.group_cols, sort=False, dropna=False, observed=True
+            )
+        else:
+            grouped = df.groupby(np.zeros(len(df), dtype=np.int8), sort=False)
+
+        sizes = grouped.size()
+        if not self.group_cols:
+            keys = [()]
+        elif isinstance(sizes.index, pd.MultiIndex):
+            keys = sizes.index.tolist()
+        else:
+            keys = [(k,) for k in sizes.index.tolist()]
+
+        stats = {}
+        for col in value_cols:
+            wanted = sorted({stat for c, stat in self._stat_keys if c == col})
+            agg = grouped[col].agg([s for s in wanted if s != "m2"])
+            agg = agg.reindex(sizes.index)
+            for stat in wanted:
+                if stat == "m2":
+                    values = grouped[col].var(ddof=0).reindex(sizes.index)
+                    values = (values * agg["count"]).fillna(0.0)
+                else:
+                    values = agg[stat]
+                stats[(col, stat)] = values.to_numpy(dtype=np.float64)
+
+        sketches = {}
+        if self._sketches:
+            codes = grouped.ngroup().to_numpy()
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(sizes) + 1))
+            for key in self._sketches:
+                col, kind, param = key
+                make = HyperLogLog if kind == "HyperLogLog" else TDigest
+                values = df[col].to_numpy()[order]
+                sketches[key] = [
+                    make(param).update(values[bounds[g] : bounds[g + 1]])
+                    for g in range(len(sizes))
+                ]
+
+        self._absorb(keys, sizes.to_numpy(dtype=np.int64), stats, sketches)
+        return self
+
+    def merge(self, other: "IncrementalSummary") -> "IncrementalSummary":
+        if (self.group_cols, self.metrics, self.ddof) != (
+            other.group_cols,
+            other.metrics,
+            other.ddof,
+        ):
+            raise ValueError("merge: summaries have different groupby or metrics")
+
+        size = len(other._keys)
+        self._absorb(
+            other._keys,
+            other._rows[:size],
+            {key: values[:size] for key, values in other._stats.items()},
+            {key: copy.deepcopy(sk[:size]) for key, sk in other._sketches.items()},
+        )
+        return self
+
+    def summary(self) -> Tibble:
+        size = len(self._keys)
+        rows = self._rows[:size]
+        stats = {key: values[:size] for key, values in self._stats.items()}
+
+        keys = [
+            tuple(np.nan if v is _MISSING else v for v in key) for key in self._keys
+        ]
+        out = pd.DataFrame(keys, columns=self.group_cols)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for name, (col, fn, args) in self.metrics.items():
+                if fn in _SKETCHES:
+                    sketches = self._sketches[_sketch_key(col, fn, args)][:size]
+                    if fn == "approx_distinct":
+                        values = [
+                            s.estimate() if s is not None else 0 for s in sketches
+                        ]
+                    else:
+                        q = args[0] if fn == "approx_quantile" else 0.5
+                        values = [
+                            s.quantile(q) if s is not None else np.nan for s in sketches
+                        ]
+                elif fn == "n":
+                    values = rows
+                elif fn in ("count", "sum", "min", "max"):
+                    values = stats[(col, fn)]
+                elif fn == "mean":
+                    values = stats[(col, "sum")] / stats[(col, "count")]
+                else:
+                    n = stats[(col, "count")]
+                    values = np.where(
+                        n > self.ddof, stats[(col, "m2")] / (n - self.ddof), np.nan
+                    )
+                    if fn == "std":
+                        values = np.sqrt(values)
+                out[name] = values
+
+        if self.group_cols:
+            out = out.sort_values(self.group_cols)
+
+        return Tibble(out.reset_index(drop=True))
+
+    # ---------- Persistence ----------
+
+    def save(self, path: str | os.PathLike) -> None:
+        size = len(self._keys)
+        state = {
+            "group_cols": self.group_cols,
+            "ddof": self.ddof,
+            "metrics": self.metrics,
+            "keys": self._keys,
+            "rows": self._rows[:size].copy(),
+            "stats": {key: values[:size].copy() for key, values in self._stats.items()},
+            "sketches": {key: sk[:size] for key, sk in self._sketches.items()},
+        }
+
+        # Write-then-rename so a crash mid-save never corrupts the last state
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "IncrementalSummary":
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+
+        out = cls.__new__(cls)
+        out.group_cols = state["group_cols"]
+        out.ddof = state["ddof"]
+        out.metrics = state["metrics"]
+        out._stat_keys = sorted(state["stats"])
+        out._keys = [_normalize_key(key) for key in state["keys"]]
+        out._index = {key: i for i, key in enumerate(out._keys)}
+        out._rows = state["rows"]
+        out._stats = state["stats"]
+        out._sketches = {key: list(sk) for key, sk in state["sketches"].items()}
+        return out
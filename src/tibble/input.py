@@ -1,11 +1,70 @@
 from __future__ import annotations
 
+from .cache import memoized
 from .tibble import Tibble 
 
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from glob import glob
+from itertools import repeat
+
 import pandas as pd
 
+from . import utils
+
+
+def expand_paths(src) -> list[str] | None:
+    """
+    Paths named by a glob pattern or list, or None for a single source
+    (including URLs and existing files whose names contain glob characters).
+    """
+    if isinstance(src, (str, os.PathLike)):
+        path = os.fspath(src)
+        if not utils.is_glob(path):
+            return None
+        paths = sorted(glob(path))
+        if not paths:
+            raise FileNotFoundError(f"read_csv: no files match {path!r}")
+        return paths
+
+    if isinstance(src, (list, tuple)):
+        return [os.fspath(p) for p in src]
+
+    return None
+
+
+def _read_one(path, args, kwargs, source) -> pd.DataFrame:
+    df = pd.read_csv(path, *args, **kwargs)
+    if source:
+        # A one-category column per file; concat unions the categories
+        df[source] = pd.Categorical.from_codes([0] * len(df), [os.fspath(path)])
+    return df
+
+
+@memoized("read_csv", files=True)
+def read_csv(
+    filepath_or_buffer,
+    *args,
+    source: str | None = None,
+    max_workers: int | None = None,
+    processes: bool = False,
+    **kwargs,
+) -> "Tibble":
+    paths = expand_paths(filepath_or_buffer)
+    if paths is None:
+        if source and isinstance(filepath_or_buffer, (str, os.PathLike)):
+            return Tibble._wrap(_read_one(filepath_or_buffer, args, kwargs, source))
+        return Tibble._wrap(pd.read_csv(filepath_or_buffer, *args, **kwargs))
+
+    if kwargs.get("chunksize") or kwargs.get("iterator"):
+        raise ValueError("read_csv: chunked reading takes a single file")
 
-def read_csv(*args, **kwargs) -> "Tibble":
-    df = pd.read_csv(*args, **kwargs)
+    # Shards parse concurrently; results come back in path order
+    workers = min(max_workers or os.cpu_count() or 1, max(len(paths), 1))
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as ex:
+        frames = list(
+            ex.map(_read_one, paths, repeat(args), repeat(kwargs), repeat(source))
+        )
 
-    return Tibble(df)
+    return Tibble._wrap(utils.concat_frames(frames))
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+from .tibble import Tibble
+from .verbs_output import to_csv
+from .verbs_rows import arrange, distinct
+from .verbs_transform import count, summarize, table
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024**2
+_MERGE_FAN_IN = 16
+
+
+def _frames(path: str) -> Iterator[pd.DataFrame]:
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _bytes_per_row(df: pd.DataFrame) -> float:
+    if len(df) == 0:
+        return 1.0
+    return max(df.memory_usage(deep=True, index=False).sum() / len(df), 1.0)
+
+
+def _canonical(s: pd.Series) -> pd.Series:
+    # hash_pandas_object hashes dtype bits, so equal keys must share a dtype
+    # across chunks: an int key column that picks up an NA turns float
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(s.cat.categories.dtype)
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.astype(np.float64)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s
+    return s.astype(str).where(s.notna(), "")
+
+
+def _key_hashes(df: pd.DataFrame, cols: Sequence[str]) -> np.ndarray:
+    keys = pd.DataFrame({c: _canonical(df[c]) for c in cols})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class PartitionedTibble:
+    """
+    A Tibble spilled to local files in `n_partitions` pieces, for data that
+    does not fit in memory. With `by`, rows are hash-partitioned on those
+    columns so every group lives in exactly one partition; grouped verbs
+    then run one partition at a time within `memory_budget` bytes.
+
+        pt = PartitionedTibble.from_csv("events.csv", by="user")
+        pt.summarize(groupby="user", n="len($ts)")
+        pt.arrange("-ts").collect()
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[Tibble | pd.DataFrame] = (),
+        by: str | Sequence[str] | None = None,
+        n_partitions: int = 64,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: str | os.PathLike | None = None,
+    ):
+        self.by = None if by is None else utils.normalize_columns_args(by)
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self._dir = tempfile.mkdtemp(prefix="tibble-", dir=spill_dir)
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self._dir, ignore_errors=True
+        )
+        self._paths = [
+            os.path.join(self._dir, f"part-{i:05d}.pkl") for i in range(n_partitions)
+        ]
+        self._rows = 0
+        self._columns = None
+
+        for i, chunk in enumerate(chunks):
+            self.append(chunk, _round_robin=i)
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: str | os.PathLike,
+        by: str | Sequence[str] | None = None,
+        n_partitions: int | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: str | os.PathLike | None = None,
+        **kwargs: Any,
+    ) -> "PartitionedTibble":
+        sample = pd.read_csv(path, nrows=1000, **kwargs)
+        chunksize = max(int(memory_budget // (4 * _bytes_per_row(sample))), 1)
+
+        if n_partitions is None:
+            # Parsed frames typically take a few times their CSV size in memory
+            n_partitions = max(math.ceil(3 * os.path.getsize(path) / memory_budget), 1)
+
+        return cls(
+            pd.read_csv(path, chunksize=chunksize, **kwargs),
+            by=by,
+            n_partitions=n_partitions,
+            memory_budget=memory_budget,
+            spill_dir=spill_dir,
+        )
+
+    def _like(self, by=None, n_partitions=None) -> "PartitionedTibble":
+        return type(self)(
+            by=by,
+            n_partitions=n_partitions or self.n_partitions,
+            memory_budget=self.memory_budget,
+            spill_dir=self.spill_dir,
+        )
+
+    # ---------- Core dunder methods ----------
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __repr__(self) -> str:
+        return (
+            f"PartitionedTibble(rows={self._rows}, partitions={self.n_partitions}, "
+            f"by={self.by}, columns={self._columns})"
+        )
+
+    def __enter__(self) -> "PartitionedTibble":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._finalizer()
+
+    @property
+    def n_partitions(self) -> int:
+        return len(self._paths)
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns or [])
+
+    # ---------- Spilling ----------
+
+    def _spill(self, i: int, df: pd.DataFrame) -> None:
+        with open(self._paths[i], "ab") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def append(self, chunk: Tibble | pd.DataFrame, _round_robin: int = 0) -> None:
+        df = chunk._df if isinstance(chunk, Tibble) else chunk
+        if len(df) == 0:
+            return
+
+        if self._columns is None:
+            self._columns = list(df.columns)
+        self._rows += len(df)
+
+        if self.by is None:
+            self._spill(_round_robin % self.n_partitions, df)
+            return
+
+        missing = [c for c in self.by if c not in df.columns]
+        if missing:
+            raise KeyError(f"PartitionedTibble: partition columns not found: {missing}")
+
+        hashes = _key_hashes(df, self.by)
+        part = (hashes % np.uint64(self.n_partitions)).astype(np.intp)
+        order = np.argsort(part, kind="stable")
+        bounds = np.searchsorted(part[order], np.arange(self.n_partitions + 1))
+        for i in range(self.n_partitions):
+            if bounds[i] < bounds[i + 1]:
+                self._spill(i, df.iloc[order[bounds[i] : bounds[i + 1]]])
+
+    # ---------- Access ----------
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        for path in self._paths:
+            yield from _frames(path)
+
+    def iter_partitions(self) -> Iterator[pd.DataFrame]:
+        for path in self._paths:
+            frames = list(_frames(path))
+            if frames:
+                yield pd.concat(frames, ignore_index=True)
+
+    def collect(self) -> Tibble:
+        frames = list(self.iter_chunks())
+        if not frames:
+            return Tibble(pd.DataFrame(columns=self.columns))
+        return Tibble(pd.concat(frames, ignore_index=True))
+
+    def repartition(
+        self, by: str | Sequence[str], n_partitions: int | None = None
+    ) -> "PartitionedTibble":
+        out = self._like(by=by, n_partitions=n_partitions)
+        for chunk in self.iter_chunks():
+            out.append(chunk)
+        return out
+
+    def _partitioned_on(self, cols: Sequence[str]) -> "PartitionedTibble":
+        # Hash partitions on a subset of the group key keep each group whole
+        if self.by is not None and set(self.by) <= set(cols):
+            return self
+        return self.repartition(cols)
+
+    # ---------- Grouped verbs ----------
+
+    def summarize(self, groupby: str | Sequence[str], **metrics: Any) -> Tibble:
+        if not groupby:
+            raise ValueError(
+                "PartitionedTibble.summarize requires groupby; use "
+                "IncrementalSummary for ungrouped aggregates"
+            )
+        group_cols = utils.normalize_columns_args(groupby)
+
+        out = [
+            summarize(part, group_cols, **metrics)
+            for part in self._partitioned_on(group_cols).iter_partitions()
+        ]
+        if not out:
+            return Tibble(pd.DataFrame(columns=group_cols + list(metrics)))
+
+        res = pd.concat(out, ignore_index=True).sort_values(group_cols)
+        return Tibble(res.reset_index(drop=True))
+
+    def table(
+        self,
+        row: str | Sequence[str] = None,
+        col: str | Sequence[str] = None,
+        weight: str | None = None,
+        sparse: bool = False,
+    ) -> Tibble:
+        # Cell counts merge across chunks, so no repartitioning is needed
+        return Tibble(table(self.iter_chunks(), row, col, weight=weight, sparse=sparse))
+
+    def distinct(
+        self, *cols: str | Iterable[str], keep="first", keep_all: bool = False
+    ) -> "PartitionedTibble":
+        """
+        Distinct rows, deduplicated one hash partition at a time; rows keep
+        their order within a partition but not across partitions.
+        """
+        keys = utils.normalize_columns_args(*cols) if cols else self.columns
+        src = self._partitioned_on(keys)
+        out = self._like(by=src.by)
+        for i, path in enumerate(src._paths):
+            frames = list(_frames(path))
+            if not frames:
+                continue
+            part = distinct(
+                pd.concat(frames, ignore_index=True),
+                *cols,
+                keep=keep,
+                keep_all=keep_all,
+            )
+            if len(part):
+                out._columns = list(part.columns)
+                out._rows += len(part)
+                out._spill(i, part)
+        return out
+
+    def count(
+        self,
+        *cols: str | Iterable[str],
+        sort: bool = False,
+        weight: str | None = None,
+        name: str = "n",
+    ) -> Tibble:
+        # Each group lives in one partition, so partition counts just stack
+        keys = utils.normalize_columns_args(*cols) if cols else []
+        if not keys:
+            return Tibble(count(self.iter_chunks(), weight=weight, name=name))
+
+        out = [
+            count(part, keys, weight=weight, name=name)
+            for part in self._partitioned_on(keys).iter_partitions()
+        ]
+        if not out:
+            return Tibble(pd.DataFrame(columns=keys + [name]))
+
+        res = pd.concat(out, ignore_index=True)
+        if sort:
+            res = res.sort_values(name, ascending=False, kind="stable")
+        return Tibble(res.reset_index(drop=True))
+
+    def to_csv(self, path_or_buf=None, **kwargs):
+        return to_csv(self.iter_chunks(), path_or_buf, **kwargs)
+
+    # ---------- External sort ----------
+
+    def arrange(self, *cols: str | Iterable[str]) -> "PartitionedTibble":
+        """
+        External merge sort: memory-sized sorted runs are spilled, then
+        merged block by block (in several passes if there are many runs)
+        into range partitions that are in order.
+        """
+        norm_cols = utils.normalize_columns_args(*cols)
+        keys = [c.lstrip("-") for c in norm_cols]
+        ascending = [not c.startswith("-") for c in norm_cols]
+
+        runs = self._like(n_partitions=1)
+        runs._paths = []
+        pending, pending_bytes = [], 0.0
+        for chunk in self.iter_chunks():
+            pending.append(chunk)
+            pending_bytes += _bytes_per_row(chunk) * len(chunk)
+            if pending_bytes >= self.memory_budget / 2:
+                runs._write_run([arrange(pd.concat(pending), *norm_cols)])
+                pending, pending_bytes = [], 0.0
+        if pending:
+            runs._write_run([arrange(pd.concat(pending), *norm_cols)])
+
+        paths = runs._paths
+        while len(paths) > _MERGE_FAN_IN:
+            runs._paths = []
+            for start in range(0, len(paths), _MERGE_FAN_IN):
+                group = paths[start : start + _MERGE_FAN_IN]
+                runs._write_run(_merge_runs(group, keys, ascending))
+                for path in group:
+                    os.remove(path)
+            paths = runs._paths
+
+        out = self._like(n_partitions=1)
+        out._paths = []
+        out._columns = self._columns
+        out._rows = self._rows
+
+        pending, pending_bytes = [], 0.0
+        for block in _merge_runs(paths, keys, ascending):
+            pending.append(block)
+            pending_bytes += _bytes_per_row(block) * len(block)
+            if pending_bytes >= self.memory_budget / 4:
+                out._write_run([pd.concat(pending, ignore_index=True)])
+                pending, pending_bytes = [], 0.0
+        if pending:
+            out._write_run([pd.concat(pending, ignore_index=True)])
+
+        runs.close()
+        return out
+
+    def _write_run(self, frames: Iterable[pd.DataFrame]) -> None:
+        # Runs are stored as small blocks so a k-way merge can stream them
+        fd, path = tempfile.mkstemp(prefix="run-", suffix=".pkl", dir=self._dir)
+        self._paths.append(path)
+        with os.fdopen(fd, "ab") as f:
+            for df in frames:
+                block_rows = max(
+                    int(self.memory_budget // (4 * _MERGE_FAN_IN * _bytes_per_row(df))),
+                    1,
+                )
+                for start in range(0, len(df), block_rows):
+                    block = df.iloc[start : start + block_rows].reset_index(drop=True)
+                    pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _merge_runs(
+    paths: Sequence[str], keys: list[str], ascending: list[bool]
+) -> Iterator[pd.DataFrame]:
+    readers = [_frames(path) for path in paths]
+    buffers = [pd.DataFrame() for _ in paths]
+    done = [False for _ in paths]
+
+    while True:
+        for i, reader in enumerate(readers):
+            if not done[i] and len(buffers[i]) == 0:
+                block = next(reader, None)
+                done[i] = block is None
+                if block is not None:
+                    buffers[i] = block
+
+        live = [i for i, b in enumerate(buffers) if len(b)]
+        if not live:
+            return
+
+        all_rows = pd.concat([buffers[i] for i in live], ignore_index=True)
+        run_ids = np.repeat(live, [len(buffers[i]) for i in live])
+
+        # Rows up to the smallest last-buffered key among runs with unread
+        # blocks are final; the stable sort keeps ties ahead of the frontier
+        tails = [buffers[i].iloc[[-1]][keys] for i in live if not done[i]]
+        probe = all_rows[keys]
+        if tails:
+            frontier = pd.concat(tails, ignore_index=True)
+            frontier = frontier.sort_values(keys, ascending=ascending).iloc[[0]]
+            probe = pd.concat([probe, frontier], ignore_index=True)
+
+        order = probe.sort_values(keys, ascending=ascending, kind="stable").index
+        order = order.to_numpy()
+        if tails:
+            order = order[: np.flatnonzero(order == len(all_rows))[0]]
+
+        taken = np.bincount(run_ids[order], minlength=len(buffers))
+        for i in live:
+            buffers[i] = buffers[i].iloc[taken[i] :]
+
+        yield all_rows.iloc[order].reset_index(drop=True)
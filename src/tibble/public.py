@@ -5,10 +5,50 @@ from .tibble import Tibble
 import numpy as np
 import pandas as pd
 
+from . import utils, verbs_output, verbs_rows, verbs_transform
+
 
 def concat(objs, **kwargs) -> "Tibble":
-    df = Tibble(pd.concat([x._df for x in objs], **kwargs))
-    return df
+    frames = [x._df if isinstance(x, Tibble) else x for x in objs]
+    if kwargs:
+        return Tibble(pd.concat(frames, **kwargs))
+
+    return Tibble._wrap(utils.concat_frames(frames))
+
+
+def table(objs, row=None, col=None, weight=None, sparse=False) -> "Tibble":
+    """Contingency counts accumulated over an iterable of Tibbles or frames."""
+    return Tibble(verbs_transform.table(objs, row, col, weight=weight, sparse=sparse))
+
+
+def distinct(objs, *cols, keep="first", keep_all=False) -> "Tibble":
+    """Distinct rows over an iterable of Tibbles or frames, first seen wins."""
+    return Tibble._wrap(
+        verbs_rows.distinct(objs, *cols, keep=keep, keep_all=keep_all)
+    )
+
+
+def count(objs, *cols, sort=False, weight=None, name="n") -> "Tibble":
+    """Group counts accumulated over an iterable of Tibbles or frames."""
+    return Tibble._wrap(
+        verbs_transform.count(objs, *cols, sort=sort, weight=weight, name=name)
+    )
+
+
+def slice_sample(
+    objs, n=None, frac=None, groupby=None, weight=None, seed=None
+) -> "Tibble":
+    """Reservoir sample over an iterable of Tibbles or frames, one pass."""
+    return Tibble._wrap(
+        verbs_rows.slice_sample(
+            objs, n=n, frac=frac, groupby=groupby, weight=weight, seed=seed
+        )
+    )
+
+
+def to_csv(objs, path_or_buf=None, **kwargs):
+    """Write an iterable of Tibbles or frames as one CSV, chunk by chunk."""
+    return verbs_output.to_csv(objs, path_or_buf, **kwargs)
 
 
 def notin(element, test_elements):
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+
+
+@dataclass(frozen=True)
+class Field:
+    name: str
+    position: int
+    dtype: Any
+    nullable: bool  # False only when the dtype cannot hold missing values
+
+
+def _nullable(dtype) -> bool:
+    return not (isinstance(dtype, np.dtype) and dtype.kind in "biu")
+
+
+def _placeholder(dtype, holds_strings: bool = False):
+    # A non-missing value where the dtype allows one, so a dry run trips over
+    # the same type errors real rows would; object columns of strings (the
+    # usual string storage before pandas 3) get a string, other object
+    # columns NA, which propagates through most operations instead of raising
+    if holds_strings:
+        return "a"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories[0] if len(dtype.categories) else None
+    if pd.api.types.is_bool_dtype(dtype):
+        return True
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 1
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.Timestamp("2000-01-01", tz=getattr(dtype, "tz", None))
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return pd.Timedelta(0)
+    if pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        return "a"
+    return pd.NA
+
+
+def _holds_strings(s: pd.Series) -> bool:
+    if len(s) == 0:
+        return False
+    first = s.iat[0]
+    if pd.isna(first):
+        i = s.first_valid_index()
+        first = None if i is None else s.at[i]
+    return isinstance(first, str)
+
+
+def expr_columns(expr: str) -> list:
+    """Columns an expression string refers to as `$col`, in order."""
+    return list(dict.fromkeys(utils.COLUMN_REF.findall(expr)))
+
+
+class Schema:
+    """
+    Column names mapped to position, dtype and nullability, built once per
+    Tibble and carried from verb to verb: column-only verbs derive the new
+    schema from the old one instead of rescanning the frame, and lookups
+    are dict hits however wide the table is.
+    """
+
+    def __init__(
+        self, names: Sequence[str], dtypes: Sequence[Any], strings: Iterable = ()
+    ):
+        self._names = list(names)
+        self._dtypes = list(dtypes)
+        self._strings = frozenset(strings)  # object columns holding str
+        self._index = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Schema":
+        strings = [
+            name
+            for i, (name, dtype) in enumerate(df.dtypes.items())
+            if pd.api.types.is_object_dtype(dtype) and _holds_strings(df.iloc[:, i])
+        ]
+        return cls(df.columns, df.dtypes, strings)
+
+    @property
+    def _positions(self) -> dict:
+        # Built on first lookup; schemas that are only passed along never pay
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self._names)}
+        return self._index
+
+    def __repr__(self) -> str:
+        cols = ", ".join(f"{n}: {t}" for n, t in zip(self._names, self._dtypes))
+        return f"Schema({cols})"
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, Schema)
+            and self._names == other._names
+            and self._dtypes == other._dtypes
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._positions
+
+    def __getitem__(self, name: str) -> Field:
+        i = self._positions[name]
+        dtype = self._dtypes[i]
+        return Field(name, i, dtype, _nullable(dtype))
+
+    @property
+    def names(self) -> list:
+        return list(self._names)
+
+    @property
+    def dtypes(self) -> dict:
+        return dict(zip(self._names, self._dtypes))
+
+    def position(self, name: str) -> int:
+        return self._positions[name]
+
+    def dtype(self, name: str):
+        return self._dtypes[self._positions[name]]
+
+    def nullable(self, name: str) -> bool:
+        return _nullable(self.dtype(name))
+
+    # ---------- Validation ----------
+
+    def missing(self, cols: Sequence[str]) -> list:
+        positions = self._positions
+        return [c for c in cols if c not in positions]
+
+    def require(self, cols: Sequence[str], verb: str) -> None:
+        missing = self.missing(cols)
+        if missing:
+            raise KeyError(f"{verb}: columns not found: {missing}")
+
+    def sample(self) -> pd.DataFrame:
+        """A one-row frame of placeholder values in these dtypes, for dry runs."""
+        by_dtype = {}
+        for name, dtype in zip(self._names, self._dtypes):
+            key = (dtype, name in self._strings)
+            by_dtype.setdefault(key, []).append(name)
+
+        # One 2-D block per numpy dtype keeps this cheap on very wide schemas
+        frames = []
+        for (dtype, holds_strings), names in by_dtype.items():
+            value = pd.Series([_placeholder(dtype, holds_strings)], dtype=dtype)
+            if isinstance(dtype, np.dtype):
+                block = np.repeat(value.to_numpy()[:, None], len(names), axis=1)
+                frames.append(pd.DataFrame(block, columns=names))
+            else:
+                frames.append(pd.DataFrame({name: value for name in names}))
+
+        if not frames:
+            return pd.DataFrame(index=pd.RangeIndex(1))
+        return pd.concat(frames, axis=1)[self._names]
+
+    # ---------- Incremental updates ----------
+
+    def select(self, cols: Sequence[str]) -> "Schema":
+        positions, dtypes = self._positions, self._dtypes
+        strings = self._strings.intersection(cols)
+        return Schema(cols, [dtypes[positions[c]] for c in cols], strings)
+
+    def drop(self, cols: Sequence[str]) -> "Schema":
+        dropped = set(cols)
+        kept = [i for i, name in enumerate(self._names) if name not in dropped]
+        return Schema(
+            [self._names[i] for i in kept],
+            [self._dtypes[i] for i in kept],
+            self._strings - dropped,
+        )
+
+    def rename(self, mapping: Mapping[str, str]) -> "Schema":
+        """`mapping` is old name -> new name."""
+        return Schema(
+            [mapping.get(n, n) for n in self._names],
+            self._dtypes,
+            [mapping.get(n, n) for n in self._strings],
+        )
+
+    def with_columns(self, dtypes: Mapping[str, Any]) -> "Schema":
+        """Replace or append columns, as assignment does."""
+        names, types = list(self._names), list(self._dtypes)
+        positions = self._positions
+        for name, dtype in dtypes.items():
+            if name in positions:
+                types[positions[name]] = dtype
+            else:
+                names.append(name)
+                types.append(dtype)
+        # Replaced columns no longer say what their objects hold
+        return Schema(names, types, self._strings - set(dtypes))
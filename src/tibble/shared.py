@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .tibble import Tibble
+
+_MAGIC = b"TBLSHM01"
+_HEADER = struct.Struct("<8sQ")
+_ALIGN = 64
+_track_lock = threading.Lock()
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _column_buffers(df: pd.DataFrame):
+    # (layout entry without offset, array to copy) per column
+    for name, col in df.items():
+        dtype = col.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Codes are shared; the categories travel in the pickled header
+            # and are unpickled once per attaching process
+            cat = col.array
+            codes = np.asarray(cat.codes)
+            entry = {
+                "name": name,
+                "kind": "category",
+                "dtype": codes.dtype.str,
+                "categories": cat.categories,
+                "ordered": cat.ordered,
+            }
+            yield entry, codes
+        elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            yield {"name": name, "kind": "array", "dtype": dtype.str}, col.to_numpy()
+        else:
+            # Strings have no fixed-width buffer; decoding them per worker
+            # would cost one private copy each, so they must be encoded first
+            raise TypeError(
+                f"SharedTibble: column {name!r} has dtype {dtype}, which has no "
+                "shareable buffer; convert it to a numpy dtype, or to categorical "
+                "if it has few distinct values (integer codes plus a separate "
+                "lookup table suit high-cardinality keys)"
+            )
+
+
+def _open_shm(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 registers attachers with the resource tracker, which then
+    # unlinks the segment when the attaching process exits (or, when the
+    # tracker is shared with the owner, double-unregisters it)
+    with _track_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedTibble:
+    """
+    A Tibble published once into shared memory (or a memory-mapped file, with
+    `path`) so that other processes can attach to it read-only, zero-copy.
+    Numeric, bool, datetime and categorical columns are shared as-is; other
+    columns, including strings, are rejected. A categorical's codes live in
+    the shared buffer but its categories are unpickled by every process
+    that attaches, so it only suits low-cardinality columns. Pickling a
+    SharedTibble sends only the segment name, so passing it to pool workers
+    is cheap:
+
+        shared = SharedTibble(ref)
+        pool.map(work, [shared] * n_workers)
+
+        def work(shared):
+            ref = shared.tibble()  # read-only view, no copy
+
+    The publishing process owns the segment and removes it on `close()`.
+    """
+
+    def __init__(
+        self, tbl: Tibble | pd.DataFrame, path: str | os.PathLike | None = None
+    ):
+        df = tbl._df if isinstance(tbl, Tibble) else tbl
+
+        layout, arrays, offset = [], [], 0
+        for entry, arr in _column_buffers(df):
+            entry["offset"], entry["length"] = offset, len(arr)
+            layout.append(entry)
+            arrays.append(arr)
+            offset = _aligned(offset + arr.nbytes)
+
+        meta = pickle.dumps(
+            {
+                "rows": len(df),
+                "columns": layout,
+                "fingerprint": getattr(tbl, "_fingerprint", None),
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        data_start = _aligned(_HEADER.size + len(meta))
+        size = max(data_start + offset, 1)
+
+        self.path = None if path is None else os.fspath(path)
+        if self.path is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.name = self._shm.name
+            buf = self._shm.buf
+            self._finalizer = weakref.finalize(self, _unlink_shm, self._shm)
+        else:
+            with open(self.path, "wb") as f:
+                f.truncate(size)
+            with open(self.path, "r+b") as f:
+                buf = mmap.mmap(f.fileno(), size)
+            self._shm = None
+            self.name = self.path
+            self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+        out = np.frombuffer(buf, dtype=np.uint8, count=size)
+        out[: _HEADER.size] = np.frombuffer(_HEADER.pack(_MAGIC, len(meta)), np.uint8)
+        out[_HEADER.size : _HEADER.size + len(meta)] = np.frombuffer(meta, np.uint8)
+        for entry, arr in zip(layout, arrays):
+            start = data_start + entry["offset"]
+            out[start : start + arr.nbytes] = np.ascontiguousarray(arr).view(np.uint8)
+        del out
+        if self.path is not None:
+            buf.flush()
+            buf.close()
+
+        self._owner = True
+
+    @classmethod
+    def attach(cls, name: str | os.PathLike) -> "SharedTibble":
+        """Attach to a shared-memory segment by name or a published file by path."""
+        self = cls.__new__(cls)
+        self._owner = False
+        self._finalizer = None
+
+        if os.path.isfile(name):
+            self.path = self.name = os.fspath(name)
+            self._shm = None
+        else:
+            self.path, self.name = None, name
+            self._shm = _open_shm(name)
+        return self
+
+    def __reduce__(self):
+        return (type(self).attach, (self.name,))
+
+    def __repr__(self) -> str:
+        where = f"path={self.path!r}" if self.path else f"name={self.name!r}"
+        return f"SharedTibble({where}, owner={self._owner})"
+
+    def __enter__(self) -> "SharedTibble":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop this handle; the owner also removes the segment or file."""
+        if self._finalizer is not None:
+            self._finalizer()
+        elif self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                pass  # views still alive keep the mapping until collected
+
+    # ---------- Zero-copy view ----------
+
+    def _buffer(self):
+        if self._shm is not None:
+            fd = getattr(self._shm, "_fd", -1)
+            if fd < 0:
+                return self._shm.buf  # Windows: named mapping, no descriptor
+            # A separate read-only mapping owned by the views, so closing the
+            # SharedMemory handle never trips over exported buffers
+            return mmap.mmap(fd, self._shm.size, access=mmap.ACCESS_READ)
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def tibble(self) -> Tibble:
+        buf = self._buffer()
+        magic, meta_len = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"SharedTibble: {self.name!r} is not a published Tibble")
+        meta = pickle.loads(bytes(buf[_HEADER.size : _HEADER.size + meta_len]))
+        data_start = _aligned(_HEADER.size + meta_len)
+
+        cols = {}
+        for entry in meta["columns"]:
+            arr = np.frombuffer(
+                buf,
+                dtype=np.dtype(entry["dtype"]),
+                count=entry["length"],
+                offset=data_start + entry["offset"],
+            )
+            arr.setflags(write=False)
+            if entry["kind"] == "category":
+                dtype = pd.CategoricalDtype(entry["categories"], entry["ordered"])
+                arr = pd.Categorical.from_codes(arr, dtype=dtype, validate=False)
+            cols[entry["name"]] = arr
+
+        df = pd.DataFrame(cols, index=pd.RangeIndex(meta["rows"]), copy=False)
+        out = Tibble._wrap(df)
+        out._fingerprint = meta["fingerprint"]
+        out._shared = self  # the mapping must outlive the column views
+        return out
+
+
+def _unlink_shm(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        pass  # views still alive keep the mapping until collected
+    shm.unlink()
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _values(values) -> np.ndarray:
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    return values[values.notna()].to_numpy()
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= np.uint64(1 << shift)
+        n[big] += shift
+        x[big] >>= np.uint64(shift)
+    return n + (x > 0)
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch with 2**precision one-byte registers.
+    The relative standard error is about 1.04 / sqrt(2**precision), i.e.
+    0.81% at the default precision of 14 (16 KiB per sketch).
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, estimate={self.estimate()})"
+
+    def update(self, values) -> "HyperLogLog":
+        values = _values(values)
+        if len(values) == 0:
+            return self
+
+        h = pd.util.hash_array(values)
+        p = np.uint64(self.precision)
+        idx = (h >> (np.uint64(64) - p)).astype(np.intp)
+        rest = h & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+
+        zeros = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest with the k2 scale function).
+    Centroid size shrinks towards both tails, so the rank error is roughly
+    proportional to min(q, 1 - q): with the default compression of 200
+    (about 100 centroids) |rank(estimate) - q| / min(q, 1 - q) is typically
+    below 3%, i.e. p99 lands within about +/-0.03 percentile points.
+    """
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __repr__(self) -> str:
+        return (
+            f"TDigest(compression={self.compression}, "
+            f"centroids={len(self.means)}, count={self.count})"
+        )
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _absorb(self, means: np.ndarray, weights: np.ndarray) -> "TDigest":
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        # Each centroid may span at most one unit of the k2 scale function
+        # k(q) = d / Z * log(q / (1 - q)), which keeps tail centroids tiny
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        z = 4 * np.log(max(total / self.compression, 1.0)) + 24
+        k = self.compression / z * np.log(q / (1 - q))
+        cluster = np.floor(k - k[0]).astype(np.intp)
+        cluster = np.unique(cluster, return_inverse=True)[1]
+
+        w = np.bincount(cluster, weights=weights)
+        self.means = np.bincount(cluster, weights=means * weights) / w
+        self.weights = w
+        return self
+
+    def update(self, values) -> "TDigest":
+        values = _values(values).astype(np.float64)
+        if len(values) == 0:
+            return self
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        return self._absorb(values, np.ones(len(values)))
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if len(other.means) == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self._absorb(other.means, other.weights)
+
+    def quantile(self, q):
+        if len(self.means) == 0:
+            return np.nan if np.ndim(q) == 0 else np.full(np.shape(q), np.nan)
+
+        centers = np.cumsum(self.weights) - self.weights / 2
+        target = np.asarray(q, dtype=np.float64) * self.count
+        xp = np.concatenate([[0.0], centers, [self.count]])
+        fp = np.concatenate([[self.min], self.means, [self.max]])
+        out = np.interp(target, xp, fp)
+        return float(out) if np.ndim(q) == 0 else out
+
+
+def approx_distinct(values, precision: int = 14) -> int:
+    """HyperLogLog estimate of the number of distinct non-null values."""
+    return HyperLogLog(precision).update(values).estimate()
+
+
+def approx_quantile(values, q, compression: float = 200):
+    """t-digest estimate of the q-th quantile(s) of the non-null values."""
+    return TDigest(compression).update(values).quantile(q)
+
+
+def approx_median(values, compression: float = 200) -> float:
+    return approx_quantile(values, 0.5, compression)
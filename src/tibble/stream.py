@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import asyncio
+import warnings
+from typing import Any, AsyncIterable, Callable, Iterable, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+from .incremental import IncrementalSummary
+from .schema import Schema, expr_columns
+from .tibble import Tibble
+from .verbs_join import join_left
+
+_DONE = object()
+
+
+def _refs(fn) -> list:
+    return expr_columns(fn) if isinstance(fn, str) else []
+
+
+def _compile(fn, caller_globals) -> Callable:
+    return utils.compile_expr(fn, caller_globals) if isinstance(fn, str) else fn
+
+
+class _LookupJoin:
+    """
+    join_left against a fixed right table with unique keys: the key index is
+    built once and each batch becomes a hash lookup plus a take, instead of
+    a full merge. Output columns match join_left exactly.
+    """
+
+    def __init__(self, right, on, on_left, on_right, suffix):
+        self.right = right
+        self.args = (on, on_left, on_right, suffix)
+        self.left_keys = utils.normalize_columns_args(on or on_left)
+        right_keys = utils.normalize_columns_args(on or on_right)
+
+        keys = right[right_keys]
+        self.unique = not keys.duplicated().any()
+        self.index = (
+            pd.MultiIndex.from_frame(keys)
+            if len(right_keys) > 1
+            else pd.Index(keys.iloc[:, 0])
+        )
+        # With `on`, merge keeps a single copy of the key columns
+        self.payload = right.drop(columns=right_keys) if on else right
+        self._layout = {}
+
+    def _columns(self, df: pd.DataFrame):
+        key = tuple(df.columns)
+        if key not in self._layout:
+            names = join_left(df.iloc[:0], self.right.iloc[:0], *self.args).columns
+            fits = len(names) == len(df.columns) + len(self.payload.columns)
+            self._layout[key] = list(names) if fits else None
+        return self._layout[key]
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        names = self._columns(df)
+        if not self.unique or names is None:
+            return join_left(df, self.right, *self.args)
+
+        keys = df[self.left_keys]
+        probe = (
+            pd.MultiIndex.from_frame(keys)
+            if len(self.left_keys) > 1
+            else keys.iloc[:, 0]
+        )
+        rows = self.index.get_indexer(probe)
+
+        arrays = [df[c].array for c in df.columns] + [
+            self.payload[c].array.take(rows, allow_fill=True)
+            for c in self.payload.columns
+        ]
+        return pd.DataFrame(dict(zip(names, arrays)), index=pd.RangeIndex(len(df)))
+
+
+def _needs(groupby, metrics) -> list:
+    cols = utils.normalize_columns_args(groupby) if groupby else []
+    for fn in metrics.values():
+        cols += _refs(fn)
+    return cols
+
+
+class _Windows:
+    """Tumbling-window grouped aggregates, emitted once the watermark passes."""
+
+    verb = "window"
+
+    def __init__(self, time_col, every, groupby, lateness, ddof, metrics):
+        self.time_col = time_col
+        self.every = every
+        self.lateness = lateness
+        self.summary_args = dict(groupby=groupby, ddof=ddof, **metrics)
+        self.needs = [time_col] + _needs(groupby, metrics)
+        self.open: dict[Any, IncrementalSummary] = {}
+        self.watermark = None
+        self.closed_until = None
+        self.late_rows = 0
+
+    def _start(self, t: pd.Series) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(t):
+            if not isinstance(self.every, pd.Timedelta):
+                self.every = pd.Timedelta(self.every)
+                self.lateness = pd.Timedelta(self.lateness)
+            return t.dt.floor(self.every)
+        return (t // self.every) * self.every
+
+    def push(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        if len(df) == 0:
+            return None
+
+        starts = self._start(df[self.time_col])
+        if self.closed_until is not None:
+            # Rows for windows already emitted arrive too late to count
+            late = (starts < self.closed_until).to_numpy()
+            self.late_rows += int(late.sum())
+            df, starts = df[~late], starts[~late]
+
+        codes, windows = pd.factorize(starts)
+        for i, start in enumerate(windows):
+            if start not in self.open:
+                self.open[start] = IncrementalSummary(**self.summary_args)
+            self.open[start].append(df[codes == i])
+
+        if len(df):
+            mark = df[self.time_col].max() - self.lateness
+            self.watermark = (
+                mark if self.watermark is None else max(self.watermark, mark)
+            )
+        return self._emit(
+            [s for s in self.open if s + self.every <= self.watermark]
+            if self.watermark is not None
+            else []
+        )
+
+    def _emit(self, starts: list) -> pd.DataFrame | None:
+        if not starts:
+            return None
+
+        frames = []
+        for start in sorted(starts):
+            out = self.open.pop(start).summary()._df
+            out.insert(0, "window", start)
+            frames.append(out)
+        end = max(starts) + self.every
+        self.closed_until = (
+            end if self.closed_until is None else max(self.closed_until, end)
+        )
+        return utils.concat_frames(frames)
+
+    def flush(self) -> pd.DataFrame | None:
+        return self._emit(list(self.open))
+
+    def current(self) -> pd.DataFrame | None:
+        frames = []
+        for start in sorted(self.open):
+            out = self.open[start].summary()._df
+            out.insert(0, "window", start)
+            frames.append(out)
+        return utils.concat_frames(frames) if frames else None
+
+
+class _Totals:
+    """Running grouped aggregates over the whole stream, emitted at the end."""
+
+    verb = "summarize"
+
+    def __init__(self, groupby, ddof, metrics):
+        self.summary = IncrementalSummary(groupby=groupby, ddof=ddof, **metrics)
+        self.needs = _needs(groupby, metrics)
+
+    def push(self, df: pd.DataFrame) -> None:
+        self.summary.append(df)
+
+    def flush(self) -> pd.DataFrame:
+        return self.summary.summary()._df
+
+    current = flush
+
+
+class Pipeline:
+    """
+    A verb chain compiled once and applied batch by batch to a stream of
+    record batches (Tibbles or DataFrames). Expressions are compiled when the
+    pipeline is built, joins against a fixed table become hash lookups, and
+    `summarize`/`window` keep mergeable per-group state instead of the rows,
+    so memory is bounded by one batch plus the aggregate state.
+
+        pipe = (
+            Pipeline()
+            .filter("$amount > 0")
+            .mutate(fee="$amount * 0.01")
+            .join_left(users, on="user")
+            .window("ts", "1min", groupby="country", total="sum($amount)")
+        )
+        for closed_windows in pipe.run(batches):
+            ...
+
+    Without a terminal `summarize`/`window`, `run` yields each transformed
+    batch. `run_async` does the same for async iterators, fetching the next
+    batch while the current one is processed in a worker thread.
+    """
+
+    def __init__(self):
+        # (verb, step, columns the step reads)
+        self._steps: List[tuple[str, Callable, list]] = []
+        self._sink = None
+        self._verified = False
+
+    def __repr__(self) -> str:
+        steps = [name for name, _, _ in self._steps]
+        if self._sink is not None:
+            steps.append(type(self._sink).__name__.strip("_").lower())
+        return f"Pipeline({' -> '.join(steps) or 'identity'})"
+
+    def _check_open(self, name: str) -> None:
+        if self._sink is not None:
+            raise TypeError(f"Pipeline: cannot add {name} after an aggregate")
+
+    def _add(self, name: str, step: Callable, needs=()) -> "Pipeline":
+        self._check_open(name)
+        self._steps.append((name, step, list(needs)))
+        self._verified = False
+        return self
+
+    # ---------- Verbs ----------
+
+    def filter(self, fn) -> "Pipeline":
+        needs = _refs(fn)
+        fn = _compile(fn, utils.caller_globals())
+        return self._add("filter", lambda df: df[fn(df)], needs)
+
+    def mutate(self, **new_cols) -> "Pipeline":
+        caller_globals = utils.caller_globals()
+        compiled = {name: _compile(fn, caller_globals) for name, fn in new_cols.items()}
+        needs, made = [], set()
+        for name, fn in new_cols.items():
+            needs += [c for c in _refs(fn) if c not in made]
+            made.add(name)
+
+        def step(df: pd.DataFrame) -> pd.DataFrame:
+            df = df.copy(deep=False)
+            for name, fn in compiled.items():
+                df[name] = fn(df)
+            return df
+
+        return self._add("mutate", step, needs)
+
+    def select(self, *cols: str | Iterable[str]) -> "Pipeline":
+        cols = utils.normalize_columns_args(*cols)
+        return self._add("select", lambda df: df[cols], cols)
+
+    def drop(self, *cols: str | Iterable[str]) -> "Pipeline":
+        cols = utils.normalize_columns_args(*cols)
+        return self._add("drop", lambda df: df.drop(columns=cols), cols)
+
+    def rename(self, **new_names) -> "Pipeline":
+        # new_name="old_name", as in Tibble.rename
+        mapping = {old: new for new, old in new_names.items()}
+        return self._add("rename", lambda df: df.rename(columns=mapping), list(mapping))
+
+    def join_left(
+        self,
+        y: Tibble | pd.DataFrame,
+        on: str | List[str] | None = None,
+        on_left: str | List[str] | None = None,
+        on_right: str | List[str] | None = None,
+        suffix: tuple = ("", "_y"),
+    ) -> "Pipeline":
+        right = y._df if isinstance(y, Tibble) else y
+        join = _LookupJoin(right, on, on_left, on_right, suffix)
+        return self._add("join_left", join, join.left_keys)
+
+    # ---------- Aggregates ----------
+
+    def summarize(
+        self, groupby: str | Sequence[str] | None = None, ddof: int = 1, **metrics
+    ) -> "Pipeline":
+        """Running totals over the whole stream; emitted when it ends."""
+        self._check_open("summarize")
+        self._sink = _Totals(groupby, ddof, metrics)
+        self._verified = False
+        return self
+
+    def window(
+        self,
+        time_col: str,
+        every,
+        groupby: str | Sequence[str] | None = None,
+        lateness=0,
+        ddof: int = 1,
+        **metrics,
+    ) -> "Pipeline":
+        """
+        Tumbling windows of width `every` on `time_col` (a frequency string
+        or Timedelta for datetimes, a number otherwise). A window is emitted
+        once the newest timestamp seen, minus `lateness`, passes its end;
+        rows arriving later for an emitted window are counted in `late_rows`.
+        """
+        self._check_open("window")
+        self._sink = _Windows(time_col, every, groupby, lateness, ddof, metrics)
+        self._verified = False
+        return self
+
+    @property
+    def late_rows(self) -> int:
+        return getattr(self._sink, "late_rows", 0)
+
+    def summary(self) -> Tibble | None:
+        """Current aggregate state (open windows, or running totals)."""
+        if self._sink is None:
+            return None
+        out = self._sink.current()
+        return None if out is None else Tibble._wrap(out)
+
+    # ---------- Type checking ----------
+
+    def check(self, schema: Schema | Tibble | pd.DataFrame) -> Schema | None:
+        """
+        Type-check the chain against an input schema without touching any
+        rows: each step must find the columns it reads, and the chain is
+        dry-run on one placeholder row so dtype errors (say, adding a number
+        to a string column) surface before the first batch is processed.
+        Returns the schema of the rows reaching the output or aggregate, or
+        None if some step cannot run on the placeholder row.
+        """
+        if isinstance(schema, Tibble):
+            schema = schema.schema
+        elif isinstance(schema, pd.DataFrame):
+            schema = Schema.from_frame(schema)
+
+        df = schema.sample()
+        for name, step, needs in self._steps:
+            schema.require(needs, f"Pipeline.{name}")
+            try:
+                with warnings.catch_warnings(), np.errstate(all="ignore"):
+                    warnings.simplefilter("ignore")
+                    df = step(df)
+            except TypeError as e:
+                raise TypeError(f"Pipeline.{name}: {e}") from e
+            except KeyError as e:
+                raise KeyError(f"Pipeline.{name}: {e.args[0] if e.args else e}") from e
+            except Exception:
+                return None  # e.g. a filter mask that is NA on placeholders
+            schema = Schema.from_frame(df)
+
+        if self._sink is not None:
+            schema.require(self._sink.needs, f"Pipeline.{self._sink.verb}")
+        return schema
+
+    # ---------- Execution ----------
+
+    def process(self, batch: Tibble | pd.DataFrame) -> Tibble | None:
+        if not self._verified:
+            # Batches of one stream share a schema, so check the first only
+            self.check(batch)
+            self._verified = True
+
+        df = batch._df if isinstance(batch, Tibble) else batch
+        for _, step, _ in self._steps:
+            df = step(df)
+
+        if self._sink is None:
+            return Tibble._wrap(df.reset_index(drop=True))
+        out = self._sink.push(df)
+        return None if out is None else Tibble._wrap(out)
+
+    def flush(self) -> Tibble | None:
+        if self._sink is None:
+            return None
+        out = self._sink.flush()
+        return None if out is None else Tibble._wrap(out)
+
+    def run(self, batches: Iterable[Tibble | pd.DataFrame]) -> Iterator[Tibble]:
+        for batch in batches:
+            out = self.process(batch)
+            if out is not None:
+                yield out
+        out = self.flush()
+        if out is not None:
+            yield out
+
+    async def run_async(self, batches: AsyncIterable | Iterable, prefetch: int = 2):
+        # A producer task keeps up to `prefetch` batches queued while the
+        # current batch is processed off the event loop
+        queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+
+        async def produce():
+            try:
+                if hasattr(batches, "__aiter__"):
+                    async for batch in batches:
+                        await queue.put(batch)
+                else:
+                    for batch in batches:
+                        await queue.put(batch)
+            finally:
+                await queue.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (batch := await queue.get()) is not _DONE:
+                out = await asyncio.to_thread(self.process, batch)
+                if out is not None:
+                    yield out
+            await producer  # re-raise errors from the source
+
+            out = self.flush()
+            if out is not None:
+                yield out
+        finally:
+            producer.cancel()
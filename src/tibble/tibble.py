@@ -5,6 +5,9 @@ from typing import Any, Hashable, Iterable, List, Mapping, Union, overload
 
 import pandas as pd
 
+from . import utils
+from .cache import memoized
+from .schema import Schema, expr_columns
 from .verbs_columns import drop, rename, select
 from .verbs_join import (
     join_anti,
@@ -17,8 +20,17 @@ from .verbs_join import (
 )
 from .verbs_output import to_csv, to_dtm, to_ggplot, to_torch, to_xy
 from .verbs_reshape import pivot_longer, pivot_wider
-from .verbs_rows import arrange, filter, omit_na, slice_head, slice_sample, slice_tail
-from .verbs_transform import mutate, summarize, table
+from .verbs_rows import (
+    arrange,
+    distinct,
+    filter,
+    omit_na,
+    slice_head,
+    slice_sample,
+    slice_tail,
+)
+from .verbs_transform import count, mutate, summarize, table
+from .zonemaps import DEFAULT_BLOCK_SIZE, ZoneMap, range_filter
 
 
 @dataclass
@@ -26,6 +38,10 @@ class Tibble:
     _df: pd.DataFrame
 
     def __init__(self, data: Union[pd.DataFrame, Mapping[str, Any]]):
+        self._fingerprint = None
+        self._sorted = {}
+        self._zone_maps = {}
+        self._schema = None
         if isinstance(data, pd.DataFrame):
             self._df = data.copy()
         elif isinstance(data, Mapping):
@@ -43,6 +59,40 @@ class Tibble:
     def from_pandas(cls, df: pd.DataFrame) -> "Tibble":
         return cls(df.copy())
 
+    @classmethod
+    def _wrap(cls, df: pd.DataFrame) -> "Tibble":
+        # Adopt a frame the caller just built and owns, skipping the copy
+        out = cls.__new__(cls)
+        out._df = df
+        out._fingerprint = None
+        out._sorted = {}
+        out._zone_maps = {}
+        out._schema = None
+        return out
+
+    def _keep_sorted(self, out: "Tibble") -> "Tibble":
+        # Row subsets keep their order, so known-sorted columns stay sorted
+        out._sorted = {c: v for c, v in self._sorted.items() if c in out._df.columns}
+        return out
+
+    def _keep_schema(self, out: "Tibble", schema: Schema | None = None) -> "Tibble":
+        # Verbs that keep or only reshuffle columns derive the new schema
+        # from this one rather than from the result frame
+        out._schema = self._schema if schema is None else schema
+        return out
+
+    def _check_columns(self, verb: str, exprs=(), groupby=None) -> None:
+        # Fail on unknown `$col` references before any work runs; mutate
+        # expressions may refer to columns made earlier in the same call
+        refs = utils.normalize_columns_args(groupby) if groupby else []
+        made = set()
+        for name, fn in exprs:
+            if isinstance(fn, str):
+                refs += [c for c in expr_columns(fn) if c not in made]
+            if verb == "mutate":
+                made.add(name)
+        self.schema.require(list(dict.fromkeys(refs)), verb)
+
     def to_pandas(self) -> pd.DataFrame:
         return self._df.copy()
 
@@ -78,47 +128,158 @@ class Tibble:
 
     def __setitem__(self, key: Hashable, value: Any) -> None:
         self._df[key] = value
+        self._fingerprint = None
+        self._sorted.pop(key, None)
+        self._zone_maps.pop(key, None)
+        if self._schema is not None:
+            self._schema = self._schema.with_columns({key: self._df[key].dtype})
+
+    # ---------- Sort and zone-map metadata ----------
+
+    def is_sorted(self, col: str) -> bool:
+        """Whether `col` is in ascending order (nulls last); checked once."""
+        known = self._sorted.get(col)
+        if known is None:
+            known = bool(self._df[col].is_monotonic_increasing)
+            self._sorted[col] = known
+        return known
+
+    @property
+    def schema(self) -> Schema:
+        """Column names, positions, dtypes and nullability; built once."""
+        if self._schema is None:
+            self._schema = Schema.from_frame(self._df)
+        return self._schema
+
+    def zone_map(self, *cols: str, block_size: int = DEFAULT_BLOCK_SIZE) -> "Tibble":
+        """Build per-block min/max for `cols` so range filters skip blocks."""
+        for col in utils.normalize_columns_args(*cols):
+            self._zone_maps[col] = ZoneMap(self._df[col], block_size)
+        return self
 
     # ----------------------- verbs_columns.py  ---------------------------------#
+    @memoized("select")
     def select(self, *cols: str | Iterable[str]) -> "Tibble":
-        return type(self)(select(self._df, *cols))
+        cols = utils.normalize_columns_args(*cols)
+        out = type(self)(select(self._df, cols, schema=self.schema))
+        return self._keep_sorted(self._keep_schema(out, self.schema.select(cols)))
 
+    @memoized("drop")
     def drop(self, *cols: str | Iterable[str]) -> "Tibble":
-        return type(self)(drop(self._df, *cols))
+        cols = utils.normalize_columns_args(*cols)
+        out = type(self)(drop(self._df, cols, schema=self.schema))
+        return self._keep_sorted(self._keep_schema(out, self.schema.drop(cols)))
 
+    @memoized("rename")
     def rename(self, **new_names) -> "Tibble":
-        return type(self)(rename(self._df, **new_names))
+        out = type(self)(rename(self._df, schema=self.schema, **new_names))
+        mapping = {old: new for new, old in new_names.items()}
+        return self._keep_schema(out, self.schema.rename(mapping))
 
     # ----------------------- verbs_rows.py  ------------------------------------#
+    @memoized("filter")
     def filter(self, fn, groupby=None) -> "Tibble":
-        return type(self)(filter(self._df, fn=fn, groupby=groupby))
-
+        self._check_columns("filter", [(None, fn)])
+        df = None
+        if isinstance(fn, str) and groupby is None:
+            df = range_filter(self, fn)
+        if df is None:
+            df = filter(self._df, fn=fn, groupby=groupby, schema=self.schema)
+        out = type(self)(df)
+        # Grouped filters rebuild the frame group by group, reordering rows
+        return out if groupby else self._keep_schema(self._keep_sorted(out))
+
+    @memoized("omit_na")
     def omit_na(self) -> "Tibble":
-        return type(self)(omit_na(self._df))
+        return self._keep_schema(type(self)(omit_na(self._df)))
 
+    @memoized("arrange")
     def arrange(self, *cols: str | Iterable[str]) -> "Tibble":
-        return type(self)(arrange(self._df, *cols))
+        out = self._keep_schema(type(self)(arrange(self._df, *cols)))
+        norm_cols = utils.normalize_columns_args(*cols)
+        if norm_cols and not norm_cols[0].startswith("-"):
+            out._sorted[norm_cols[0]] = True
+        return out
 
+    @memoized("slice_head")
     def slice_head(self, n: int, groupby=None) -> "Tibble":
-        return type(self)(slice_head(self._df, n=n, groupby=groupby))
+        out = type(self)(
+            slice_head(self._df, n=n, groupby=groupby, schema=self.schema)
+        )
+        return out if groupby else self._keep_schema(self._keep_sorted(out))
 
+    @memoized("slice_tail")
     def slice_tail(self, n: int, groupby=None) -> "Tibble":
-        return type(self)(slice_tail(self._df, n=n, groupby=groupby))
+        out = type(self)(
+            slice_tail(self._df, n=n, groupby=groupby, schema=self.schema)
+        )
+        return out if groupby else self._keep_schema(self._keep_sorted(out))
 
-    def slice_sample(self, n: int = None, frac: float | None = None, groupby=None) -> "Tibble":
-        return type(self)(slice_sample(self._df, n=n, frac=frac, groupby=groupby))
+    @memoized("distinct")
+    def distinct(
+        self, *cols: str | Iterable[str], keep="first", keep_all: bool = False
+    ) -> "Tibble":
+        out = type(self)(distinct(self._df, *cols, keep=keep, keep_all=keep_all))
+        if keep_all or not cols:
+            self._keep_schema(out)
+        else:
+            keys = utils.normalize_columns_args(*cols)
+            self._keep_schema(out, self.schema.select(keys))
+        # Kept rows stay in their original order
+        return self._keep_sorted(out)
+
+    def slice_sample(
+        self,
+        n: int = None,
+        frac: float | None = None,
+        groupby=None,
+        weight: str | None = None,
+        seed=None,
+    ) -> "Tibble":
+        out = type(self)(
+            slice_sample(
+                self._df, n=n, frac=frac, groupby=groupby, weight=weight, seed=seed
+            )
+        )
+        return self._keep_schema(out)
 
     # ----------------------- verbs_transform.py  -------------------------------#
+    @memoized("mutate")
     def mutate(self, groupby=None, **new_cols) -> "Tibble":
-        return type(self)(mutate(self._df, groupby, **new_cols))
-
+        self._check_columns("mutate", new_cols.items(), groupby)
+        out = type(self)(mutate(self._df, groupby, **new_cols))
+        if groupby:
+            return out
+        dtypes = {name: out._df[name].dtype for name in new_cols}
+        return self._keep_schema(out, self.schema.with_columns(dtypes))
+
+    @memoized("summarize")
     def summarize(self, groupby=None, **metrics) -> "Tibble":
+        self._check_columns("summarize", metrics.items(), groupby)
         return type(self)(summarize(self._df, groupby, **metrics))
 
-    def table(self, row: str = None, col: str = None) -> "Tibble":
-        return type(self)(table(self._df, row, col))
+    @memoized("table")
+    def table(
+        self,
+        row: str | List[str] = None,
+        col: str | List[str] = None,
+        weight: str | None = None,
+        sparse: bool = False,
+    ) -> "Tibble":
+        return type(self)(table(self._df, row, col, weight=weight, sparse=sparse))
+
+    @memoized("count")
+    def count(
+        self,
+        *cols: str | Iterable[str],
+        sort: bool = False,
+        weight: str | None = None,
+        name: str = "n",
+    ) -> "Tibble":
+        return type(self)(count(self._df, *cols, sort=sort, weight=weight, name=name))
 
     # ----------------------- verbs_join.py  ------------------------------------#
+    @memoized("join_left")
     def join_left(
         self,
         y: "Tibble",
@@ -129,6 +290,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_left(self._df, y._df, on, on_left, on_right, suffix))
 
+    @memoized("join_right")
     def join_right(
         self,
         y: "Tibble",
@@ -139,6 +301,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_right(self._df, y._df, on, on_left, on_right, suffix))
 
+    @memoized("join_inner")
     def join_inner(
         self,
         y: "Tibble",
@@ -149,6 +312,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_inner(self._df, y._df, on, on_left, on_right, suffix))
 
+    @memoized("join_outer")
     def join_outer(
         self,
         y: "Tibble",
@@ -159,6 +323,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_outer(self._df, y._df, on, on_left, on_right, suffix))
 
+    @memoized("join_semi")
     def join_semi(
         self,
         y: "Tibble",
@@ -168,6 +333,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_semi(self._df, y._df, on, on_left, on_right))
 
+    @memoized("join_anti")
     def join_anti(
         self,
         y: "Tibble",
@@ -177,6 +343,7 @@ class Tibble:
     ) -> "Tibble":
         return type(self)(join_anti(self._df, y._df, on, on_left, on_right))
 
+    @memoized("join_fuzzy")
     def join_fuzzy(
         self,
         y: "Tibble",
@@ -201,10 +368,13 @@ class Tibble:
                 by_right,
                 suffix,
                 direction,
+                left_sorted=self._sorted.get(on or on_left, False),
+                right_sorted=y._sorted.get(on or on_right, False),
             )
         )
 
     # ----------------------- verbs_reshape.py  ---------------------------------#
+    @memoized("pivot_longer")
     def pivot_longer(
         self,
         id_vars=None,
@@ -222,20 +392,39 @@ class Tibble:
             )
         )
 
+    @memoized("pivot_wider")
     def pivot_wider(self, names_from, values_from=None) -> "Tibble":
         return type(self)(
             pivot_wider(self._df, names_from=names_from, values_from=values_from)
         )
 
     # ----------------------- verbs_output.py  ----------------------------------#
-    def to_ggplot(self, mapping=None):
-        return to_ggplot(self._df, mapping=mapping)
+    def to_ggplot(self, mapping=None, reduce=None, max_points=5000, bins=100):
+        return to_ggplot(
+            self._df, mapping=mapping, reduce=reduce, max_points=max_points, bins=bins
+        )
 
-    def to_csv(self, path_or_buf) -> None:
-        return to_csv(self._df, path_or_buf)
+    def to_csv(self, path_or_buf=None, **kwargs):
+        return to_csv(self._df, path_or_buf, **kwargs)
 
-    def to_xy(self, target, features=None, drop=None, as_numpy=True):
-        return to_xy(self._df, features=features, drop=drop, as_numpy=as_numpy)
+    def to_xy(
+        self,
+        target,
+        features=None,
+        drop=None,
+        as_numpy=True,
+        sparse=False,
+        encode="onehot",
+    ):
+        return to_xy(
+            self._df,
+            target,
+            features=features,
+            drop=drop,
+            as_numpy=as_numpy,
+            sparse=sparse,
+            encode=encode,
+        )
 
     def to_torch(self, target, features=None, drop=None) -> pd.DataFrame:
         return to_torch(self._df, target, features=features, drop=drop)
@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import inspect
+import os
 import re
 from collections.abc import Iterable
 from typing import Sequence, List
 
+import numpy as np
 import pandas as pd
 
 
+GLOB_MAGIC = re.compile(r"[*?[]")
+COLUMN_REF = re.compile(r"\$([A-Za-z_]\w*)")
+_URL = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*://")
+
+
+def is_glob(path: str) -> bool:
+    """
+    Whether `path` is a glob pattern: it has glob characters, is not a URL
+    (whose query strings use `?`) and does not name an existing file, such
+    as "data[1].csv".
+    """
+    return bool(
+        GLOB_MAGIC.search(path) and not _URL.match(path) and not os.path.exists(path)
+    )
+
+
 def normalize_columns_args(*cols) -> Sequence[str]:
     if (
         len(cols) == 1
@@ -18,8 +37,63 @@ def normalize_columns_args(*cols) -> Sequence[str]:
         return list(cols)
 
 
+def missing_columns(df: pd.DataFrame, cols: Sequence[str], schema=None) -> list:
+    """Requested columns absent from the frame, looked up in its schema if known."""
+    present = df.columns if schema is None else schema
+    return [c for c in cols if c not in present]
+
+
+def key_codes(
+    df: pd.DataFrame, keys: Sequence[str], dropna: bool = False
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Dense group id per row for the key columns, built from the combined
+    factorized integer codes of each key; no sorting, no tuple objects.
+    Returns (rows, ids, n_groups); with dropna, rows holding a missing key
+    are left out of `rows` and `ids`.
+    """
+    missing = [c for c in keys if c not in df.columns]
+    if missing:
+        raise KeyError(f"columns not found: {missing}")
+
+    combined = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    space = 1
+    for k in keys:
+        codes, values = pd.factorize(df[k], use_na_sentinel=dropna)
+        size = max(len(values), 1)
+        valid &= codes >= 0
+        if space * size >= 2**62:
+            combined, dense = pd.factorize(combined)
+            space = len(dense)
+        combined = combined * size + codes
+        space *= size
+
+    rows = np.flatnonzero(valid) if dropna else np.arange(len(df))
+    combined = combined[rows] if dropna else combined
+
+    if space <= 4 * len(combined) + 1024:
+        cells = np.flatnonzero(np.bincount(combined, minlength=space))
+        lookup = np.empty(space, dtype=np.intp)
+        lookup[cells] = np.arange(len(cells))
+        return rows, lookup[combined], len(cells)
+
+    ids, cells = pd.factorize(combined)
+    return rows, ids, len(cells)
+
+
+def first_rows(rows: np.ndarray, ids: np.ndarray, n_groups: int) -> np.ndarray:
+    """Position of each group's first row."""
+    first = np.empty(n_groups, dtype=np.intp)
+    first[ids[::-1]] = rows[::-1]
+    return first
+
+
 def make_groups(
-    df: pd.DataFrame, by_: str | Sequence[str] | None = None, to_iter=False
+    df: pd.DataFrame,
+    by_: str | Sequence[str] | None = None,
+    to_iter=False,
+    schema=None,
 ) -> List:
     if by_ is None:
         if to_iter:
@@ -31,7 +105,7 @@ def make_groups(
     else:
         group_cols = list(by_)
 
-    missing_group_cols = [c for c in group_cols if c not in df.columns]
+    missing_group_cols = missing_columns(df, group_cols, schema)
     if missing_group_cols:
         raise KeyError(f"grouping columns not found: {missing_group_cols}")
 
@@ -40,13 +114,32 @@ def make_groups(
     return grouped
 
 
+def caller_globals():
+    """
+    Globals of the nearest frame outside the tibble package, so string
+    expressions see the user's imports however deep the verb is called.
+    """
+    frame = inspect.currentframe().f_back
+    while frame is not None and (
+        frame.f_globals.get("__name__", "").partition(".")[0] == "tibble"
+    ):
+        frame = frame.f_back
+
+    return frame.f_globals if frame is not None else None
+
+
+def rewrite_expr(expr: str) -> str:
+    """Rewrite `$col` references to d["col"], the form compile_expr evaluates."""
+    return COLUMN_REF.sub(r'd["\1"]', expr)
+
+
 def compile_expr(expr: str, caller_globals=None):
     """
     Turn an expression like "$a + np.mean($b)" into a function:
         f(d) -> d["a"] + np.mean(d["b"])
     where `d` is the DataFrame.
     """
-    rewritten = re.sub(r"\$([A-Za-z_]\w*)", r'd["\1"]', expr)
+    rewritten = rewrite_expr(expr)
 
     code = compile(rewritten, "<mutate-expr>", "eval")
 
@@ -57,3 +150,107 @@ def compile_expr(expr: str, caller_globals=None):
         return eval(_code, _globals, {"d": d})
 
     return fn
+
+
+def _concat_categoricals(parts: List, lengths: List[int]) -> pd.Categorical:
+    # Union the categories and remap codes instead of upcasting to object;
+    # batches usually share one categories object, so mappings are memoized
+    present = [p for p in parts if p is not None]
+    categories = present[0].categories
+    seen = {id(categories)}
+    for part in present:
+        if id(part.categories) not in seen:
+            seen.add(id(part.categories))
+            if not part.categories.equals(categories):
+                categories = categories.append(part.categories).unique()
+
+    ordered = all(p.ordered and p.categories.equals(categories) for p in present)
+
+    codes = np.full(sum(lengths), -1, dtype=np.int64)
+    mappings = {}
+    start = 0
+    for part, n in zip(parts, lengths):
+        if part is not None:
+            key = id(part.categories)
+            if key not in mappings:
+                mappings[key] = (
+                    None
+                    if part.categories.equals(categories)
+                    else categories.get_indexer(part.categories)
+                )
+            mapping = mappings[key]
+            if mapping is None:
+                codes[start : start + n] = part.codes
+            else:
+                codes[start : start + n] = np.where(
+                    part.codes >= 0, mapping[part.codes], -1
+                )
+        start += n
+
+    return pd.Categorical.from_codes(codes, categories, ordered=ordered)
+
+
+def _numpy_dtype(arr):
+    if type(arr) is pd.arrays.NumpyExtensionArray:
+        return arr.dtype.numpy_dtype
+    return arr.dtype
+
+
+def _concat_column(parts: List, lengths: List[int]):
+    present = [p for p in parts if p is not None]
+    first = _numpy_dtype(present[0])
+
+    if all(isinstance(p, pd.Categorical) for p in present):
+        return _concat_categoricals(parts, lengths)
+
+    if isinstance(first, np.dtype) and all(_numpy_dtype(p) == first for p in present):
+        dtype, fill = first, None
+        if len(present) < len(parts):
+            # Columns absent from some inputs need a missing-value sentinel
+            if dtype.kind in "iu":
+                dtype = np.dtype(np.float64)
+            elif dtype.kind == "b":
+                dtype = np.dtype(object)
+            fill = (
+                np.datetime64("NaT")
+                if dtype.kind == "M"
+                else (np.timedelta64("NaT") if dtype.kind == "m" else np.nan)
+            )
+
+        out = np.empty(sum(lengths), dtype=dtype)
+        start = 0
+        for part, n in zip(parts, lengths):
+            out[start : start + n] = fill if part is None else np.asarray(part)
+            start += n
+        return out
+
+    # Mixed or extension dtypes: let pandas pick the common type
+    series = [
+        pd.Series(p if p is not None else np.full(n, np.nan), copy=False)
+        for p, n in zip(parts, lengths)
+    ]
+    return pd.concat(series, ignore_index=True).array
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Row-wise concat that allocates each output column once from the input
+    schemas, unions categorical categories and returns a fresh RangeIndex.
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    if any(f.columns.has_duplicates for f in frames):
+        return pd.concat(frames, ignore_index=True)
+
+    columns = list(dict.fromkeys(c for f in frames for c in f.columns))
+    lengths = [len(f) for f in frames]
+
+    data = {}
+    for col in columns:
+        parts = [f[col].array if col in f.columns else None for f in frames]
+        data[col] = _concat_column(parts, lengths)
+
+    return pd.DataFrame(data, columns=columns, copy=False)
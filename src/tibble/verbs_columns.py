@@ -5,12 +5,15 @@ from typing import Iterable
 import pandas as pd
 
 from . import utils
+from .schema import Schema
 
 
-def select(df: pd.DataFrame, *cols: str | Iterable[str]) -> pd.DataFrame:
+def select(
+    df: pd.DataFrame, *cols: str | Iterable[str], schema: Schema | None = None
+) -> pd.DataFrame:
     normalized_cols = utils.normalize_columns_args(*cols)
 
-    missing = [c for c in normalized_cols if c not in df.columns]
+    missing = utils.missing_columns(df, normalized_cols, schema)
     if missing:
         raise KeyError(f"select: columns not found: {missing}")
 
@@ -19,10 +22,12 @@ def select(df: pd.DataFrame, *cols: str | Iterable[str]) -> pd.DataFrame:
     return out
 
 
-def drop(df: pd.DataFrame, *cols: str | Iterable[str]) -> pd.DataFrame:
+def drop(
+    df: pd.DataFrame, *cols: str | Iterable[str], schema: Schema | None = None
+) -> pd.DataFrame:
     normalized_cols = utils.normalize_columns_args(*cols)
 
-    missing = [c for c in normalized_cols if c not in df.columns]
+    missing = utils.missing_columns(df, normalized_cols, schema)
     if missing:
         raise KeyError(f"drop: columns not found: {missing}")
 
@@ -31,9 +36,9 @@ def drop(df: pd.DataFrame, *cols: str | Iterable[str]) -> pd.DataFrame:
     return out
 
 
-def rename(df: pd.DataFrame, **new_names) -> pd.DataFrame:
+def rename(df: pd.DataFrame, schema: Schema | None = None, **new_names) -> pd.DataFrame:
     old_cols = list(new_names.values())
-    missing = [c for c in old_cols if c not in df.columns]
+    missing = utils.missing_columns(df, old_cols, schema)
 
     if missing:
         raise KeyError(f"rename: columns not found: {missing}")
@@ -167,6 +167,8 @@ def join_fuzzy(
     by_right: str | List[str],
     suffix: tuple = ("", "_y"),
     direction="nearest",
+    left_sorted: bool = False,
+    right_sorted: bool = False,
 ) -> pd.DataFrame:
     if on_left:
         if on_left == on_right:
@@ -178,8 +180,12 @@ def join_fuzzy(
         right = right.rename(columns={on: on_right})
         right = right[[on_right] + [c for c in right.columns if c != on_right]]
 
-    left = left.copy().sort_values(on_left)
-    right = right.copy().sort_values(on_right)
+    # merge_asof needs both keys sorted; skip the sort when already known or
+    # cheaply verified (the monotonic check stops at the first inversion)
+    if not (left_sorted or left[on_left].is_monotonic_increasing):
+        left = left.sort_values(on_left)
+    if not (right_sorted or right[on_right].is_monotonic_increasing):
+        right = right.sort_values(on_right)
 
     res = pd.merge_asof(
         left=left,
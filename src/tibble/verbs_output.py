@@ -1,30 +1,435 @@
 from __future__ import annotations
 
+import functools
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
-import plotnine
-import torch
-from scipy.sparse import csr_matrix
 
+from . import utils
+
+# plotnine, torch and scipy are imported on first use: they dominate
+# `import tibble` time and memory for workers that never call them.
+
+
+_GROUP_AES = ("color", "colour", "fill", "group", "shape", "linetype")
+
+
+def _plot_columns(df: pd.DataFrame, mapping, reduce: str):
+    mapping = dict(mapping or {})
+    x, y = mapping.get("x"), mapping.get("y")
+    if not all(isinstance(c, str) and c in df.columns for c in (x, y)):
+        raise ValueError(
+            f"to_ggplot: reduce={reduce!r} needs `x` and `y` mapped to columns"
+        )
+
+    groups = [
+        v
+        for k, v in mapping.items()
+        if k in _GROUP_AES and isinstance(v, str) and v in df.columns
+    ]
+    groups = [c for c in groups if c not in (x, y)]
+    return x, y, list(dict.fromkeys(groups))
+
+
+def _as_float(s: pd.Series):
+    # Datetimes are binned as integers, then centers are mapped back
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        values, back = _as_float(s.dt.tz_convert("UTC").dt.tz_localize(None))
+        return values, lambda v: back(v).dt.tz_localize("UTC").dt.tz_convert(s.dt.tz)
+
+    arr = s.to_numpy()
+    if arr.dtype.kind in "mM":
+        return (
+            arr.view(np.int64).astype(np.float64),
+            lambda v: pd.Series(np.round(v).astype(np.int64).view(arr.dtype)),
+        )
+    return arr.astype(np.float64), lambda v: pd.Series(v)
+
+
+def _group_codes(df: pd.DataFrame, groups: list[str]):
+    if not groups:
+        return np.zeros(len(df), dtype=np.int64), None
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(df[groups]))
+    return codes.astype(np.int64), uniques.to_frame(index=False)
+
+
+def _cells_frame(df, x, y, groups, code, cx, cy, bx, by):
+    # One output row per occupied cell: group keys, cell center and count
+    cells, dense = np.unique(code, return_inverse=True)
+    counts = np.bincount(dense)
+    first = np.zeros(len(cells), dtype=np.intp)
+    first[dense[::-1]] = np.arange(len(dense))[::-1]
+
+    out = df[groups].iloc[first].reset_index(drop=True)
+    out[x] = bx(cx[first]).to_numpy()
+    out[y] = by(cy[first]).to_numpy()
+    out["count"] = counts
+    return out
+
+
+def _bin_rect(df, x, y, groups, bins):
+    fx, bx = _as_float(df[x])
+    fy, by = _as_float(df[y])
+    g, _ = _group_codes(df, groups)
+
+    def cell(v):
+        lo, hi = v.min(), v.max()
+        width = (hi - lo) / bins or 1.0
+        i = np.clip(((v - lo) / width).astype(np.int64), 0, bins - 1)
+        return i, lo + (i + 0.5) * width
+
+    ix, cx = cell(fx)
+    iy, cy = cell(fy)
+    code = (g * bins + ix) * bins + iy
+    return _cells_frame(df, x, y, groups, code, cx, cy, bx, by)
+
+
+def _bin_hex(df, x, y, groups, bins):
+    fx, bx = _as_float(df[x])
+    fy, by = _as_float(df[y])
+    g, _ = _group_codes(df, groups)
+
+    # Two offset rectangular lattices; each point goes to the nearer center
+    nx, ny = bins, max(int(bins / np.sqrt(3)), 1)
+    sx = (fx.max() - fx.min()) / nx or 1.0
+    sy = (fy.max() - fy.min()) / ny or 1.0
+    u, v = (fx - fx.min()) / sx, (fy - fy.min()) / sy
+
+    ix1, iy1 = np.round(u), np.round(v)
+    ix2, iy2 = np.floor(u), np.floor(v)
+    d1 = (u - ix1) ** 2 + 3 * (v - iy1) ** 2
+    d2 = (u - ix2 - 0.5) ** 2 + 3 * (v - iy2 - 0.5) ** 2
+    second = d2 < d1
+
+    ix = np.where(second, ix2 + 0.5, ix1)
+    iy = np.where(second, iy2 + 0.5, iy1)
+    lattice = g * 2 + second
+    code = (lattice * (2 * nx + 4) + (2 * ix).astype(np.int64)) * (2 * ny + 4)
+    code += (2 * iy).astype(np.int64)
+    cx, cy = fx.min() + ix * sx, fy.min() + iy * sy
+    return _cells_frame(df, x, y, groups, code, cx, cy, bx, by)
+
+
+def _aggregate_x(df, x, y, groups, max_points):
+    # Per-x mean with min/max envelope; x is binned if too many values
+    key = df[x]
+    if key.nunique() > max_points:
+        fx, bx = _as_float(key)
+        width = (fx.max() - fx.min()) / max_points or 1.0
+        i = np.clip(((fx - fx.min()) / width).astype(np.int64), 0, max_points - 1)
+        key = bx(fx.min() + (i + 0.5) * width).set_axis(df.index)
+
+    out = (
+        df.assign(**{x: key})
+        .groupby(groups + [x], sort=True, observed=True)[y]
+        .agg(["mean", "min", "max", "count"])
+        .reset_index()
+        .rename(columns={"mean": y, "min": "ymin", "max": "ymax"})
+    )
+    return out
+
+
+def _lttb(fx: np.ndarray, fy: np.ndarray, threshold: int) -> np.ndarray:
+    n = len(fx)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    cx, cy = np.concatenate([[0], np.cumsum(fx)]), np.concatenate([[0], np.cumsum(fy)])
+    picked = np.empty(threshold, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        lo, hi = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, n)
+        ax, ay = (cx[hi] - cx[lo]) / (hi - lo), (cy[hi] - cy[lo]) / (hi - lo)
+
+        start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+        area = np.abs(
+            (fx[a] - ax) * (fy[start:stop] - fy[a])
+            - (fx[a] - fx[start:stop]) * (ay - fy[a])
+        )
+        a = start + int(np.argmax(area))
+        picked[i + 1] = a
+
+    return picked
+
+
+def _downsample_lttb(df, x, y, groups, max_points):
+    df = df.sort_values(groups + [x], kind="stable")
+    fx, _ = _as_float(df[x])
+    fy, _ = _as_float(df[y])
+    g, _ = _group_codes(df, groups)
+
+    bounds = np.flatnonzero(np.diff(g)) + 1
+    starts = np.concatenate([[0], bounds])
+    stops = np.concatenate([bounds, [len(df)]])
+    rows = [
+        start + _lttb(fx[start:stop], fy[start:stop], max_points)
+        for start, stop in zip(starts, stops)
+    ]
+    return df.iloc[np.concatenate(rows)].reset_index(drop=True)
+
+
+# Shrink large frames to what a plot can show before plotnine sees them:
+# "bin"/"hex" count points per 2-D cell (map fill/size to "count"), "line"
+# aggregates y per x, "lttb" keeps max_points shape-preserving rows per group
+# and "auto" picks lttb for sorted or datetime x, bin otherwise.
+def reduce_for_plot(
+    df: pd.DataFrame, mapping, reduce="auto", max_points=5000, bins=100
+) -> pd.DataFrame:
+    if reduce is None or len(df) <= max_points:
+        return df
+
+    x, y, groups = _plot_columns(df, mapping, reduce)
+    df = df.dropna(subset=[x, y])
 
-def to_ggplot(df: pd.DataFrame, mapping=None) -> pd.DataFrame:
+    if reduce == "auto":
+        sequential = df[x].dtype.kind in "mM" or df[x].is_monotonic_increasing
+        reduce = "lttb" if sequential else "bin"
+
+    if reduce == "bin":
+        return _bin_rect(df, x, y, groups, bins)
+    if reduce == "hex":
+        return _bin_hex(df, x, y, groups, bins)
+    if reduce == "line":
+        return _aggregate_x(df, x, y, groups, max_points)
+    if reduce == "lttb":
+        return _downsample_lttb(df, x, y, groups, max_points)
+
+    raise ValueError(
+        f"to_ggplot: unknown reduce={reduce!r}; "
+        "use 'auto', 'bin', 'hex', 'line', 'lttb' or None"
+    )
+
+
+def to_ggplot(
+    df: pd.DataFrame, mapping=None, reduce=None, max_points=5000, bins=100
+) -> pd.DataFrame:
+    import plotnine
+
+    df = reduce_for_plot(df, mapping, reduce, max_points=max_points, bins=bins)
     return plotnine.ggplot(df, mapping)
 
 
-def to_csv(df: pd.DataFrame, path_or_buf) -> None:
-    return df.to_csv(path_or_buf, index=False)
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+
+def _zstd_module():
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        raise ValueError(
+            "to_csv: zstd compression needs Python 3.14+ or the optional "
+            "`zstandard` package (pip install zstandard)"
+        ) from None
+
+
+def _compress(data: bytes, compression: str, level: int | None) -> bytes:
+    # Each chunk is a complete member/frame; concatenated members form a
+    # valid stream for all of these formats, so chunks compress in parallel
+    if compression == "gzip":
+        import gzip
+
+        return gzip.compress(data, 6 if level is None else level, mtime=0)
+    if compression == "bz2":
+        import bz2
+
+        return bz2.compress(data, 9 if level is None else level)
+    if compression == "xz":
+        import lzma
+
+        return lzma.compress(data, preset=level)
+    if compression == "zstd":
+        zstd = _zstd_module()
+        if zstd.__name__ == "zstandard":
+            level = 3 if level is None else level
+            return zstd.ZstdCompressor(level=level).compress(data)
+        return zstd.compress(data, level)
+    raise ValueError(f"to_csv: unsupported compression {compression!r}")
+
+
+def _format_chunk(df, header, kwargs, encoding, compression, level) -> bytes:
+    data = df.to_csv(None, header=header, **kwargs).encode(encoding)
+    return data if compression is None else _compress(data, compression, level)
+
+
+def _row_chunks(df, chunksize: int):
+    if not isinstance(df, pd.DataFrame):
+        # Streaming source: re-slice each incoming chunk, never materialize
+        for chunk in df:
+            yield from _row_chunks(getattr(chunk, "_df", chunk), chunksize)
+        return
+
+    if len(df) == 0:
+        yield df
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
 
+def _write_chunks(df, write, chunksize, max_workers, processes, header, fmt_args):
+    # Chunks format (and compress) in workers and are written in order; at
+    # most two chunks per worker are in flight, bounding memory for streams
+    workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    pending = deque()
+    with pool(max_workers=workers) as ex:
+        for i, chunk in enumerate(_row_chunks(df, chunksize)):
+            first = header if i == 0 else False
+            pending.append(ex.submit(_format_chunk, chunk, first, *fmt_args))
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
 
-def to_xy(df: pd.DataFrame, target, features=None, drop=None, as_numpy=True):
-    df = df.copy()
+
+def to_csv(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    path_or_buf=None,
+    chunksize: int = 100_000,
+    max_workers: int | None = None,
+    processes: bool = False,
+    compression: str | None = "infer",
+    compresslevel: int | None = None,
+    encoding: str = "utf-8",
+    **kwargs,
+):
+    kwargs.setdefault("index", False)
+    header = kwargs.pop("header", True)
+
+    is_path = isinstance(path_or_buf, (str, os.PathLike))
+    if compression == "infer":
+        suffix = os.path.splitext(os.fspath(path_or_buf))[1] if is_path else ""
+        compression = _COMPRESSION_SUFFIXES.get(suffix.lower())
+    text_out = path_or_buf is None or isinstance(path_or_buf, io.TextIOBase)
+    if compression is not None and text_out:
+        raise ValueError("to_csv: compression needs a path or a binary buffer")
+    if compression == "zstd":
+        _zstd_module()  # fail before creating the file
+
+    fmt_args = (kwargs, encoding, compression, compresslevel)
+    run = functools.partial(
+        _write_chunks,
+        df,
+        chunksize=chunksize,
+        max_workers=max_workers,
+        processes=processes,
+        header=header,
+        fmt_args=fmt_args,
+    )
+
+    if path_or_buf is None:
+        parts = []
+        run(lambda data: parts.append(data.decode(encoding)))
+        return "".join(parts)
+    if is_path:
+        with open(path_or_buf, "wb") as f:
+            run(f.write)
+    elif text_out:
+        run(lambda data: path_or_buf.write(data.decode(encoding)))
+    else:
+        run(path_or_buf.write)
+
+
+def _sparse_blocks(X: pd.DataFrame, encode: str):
+    # Per feature column: (row ids, column offsets, values, names), rows ascending
+    for name, col in X.items():
+        if pd.api.types.is_bool_dtype(col) or pd.api.types.is_numeric_dtype(col):
+            values = col.to_numpy(dtype=np.float64, na_value=np.nan)
+            rows = np.flatnonzero(values != 0)
+            yield rows, np.zeros(len(rows), dtype=np.intp), values[rows], [str(name)]
+            continue
+
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes, levels = col.cat.codes.to_numpy(), col.cat.categories
+        else:
+            codes, levels = pd.factorize(col, sort=True)
+
+        if encode == "onehot":
+            rows = np.flatnonzero(codes >= 0)
+            yield (
+                rows,
+                codes[rows].astype(np.intp),
+                np.ones(len(rows)),
+                [f"{name}_{level}" for level in levels],
+            )
+        else:
+            # Ordinal codes; missing values are stored explicitly as NaN
+            values = np.where(codes >= 0, codes, np.nan)
+            rows = np.flatnonzero(values != 0)
+            yield rows, np.zeros(len(rows), dtype=np.intp), values[rows], [str(name)]
+
+
+def _to_sparse(X: pd.DataFrame, encode: str):
+    from scipy.sparse import csr_matrix
+
+    if encode not in ("onehot", "ordinal"):
+        raise ValueError(f"to_xy: encode must be 'onehot' or 'ordinal', got {encode!r}")
+
+    blocks = list(_sparse_blocks(X, encode))
+    n_rows = len(X)
+    per_row = np.zeros(n_rows, dtype=np.int64)
+    for rows, _, _, _ in blocks:
+        per_row += np.bincount(rows, minlength=n_rows)
+    indptr = np.concatenate([[0], np.cumsum(per_row)])
+
+    # Fill CSR arrays directly, block by block in column order, so column
+    # indices come out sorted within each row without a COO round trip
+    nnz = int(indptr[-1])
+    indices = np.empty(nnz, dtype=np.int64)
+    data = np.empty(nnz, dtype=np.float64)
+    cursor = indptr[:-1].copy()
+    names, offset = [], 0
+    for rows, cols, values, block_names in blocks:
+        at = cursor[rows]
+        indices[at] = offset + cols
+        data[at] = values
+        cursor[rows] += 1
+        names.extend(block_names)
+        offset += len(block_names)
+
+    return csr_matrix((data, indices, indptr), shape=(n_rows, offset)), names
+
+
+def to_xy(
+    df: pd.DataFrame,
+    target,
+    features=None,
+    drop=None,
+    as_numpy=True,
+    sparse=False,
+    encode="onehot",
+):
     y = df[target].to_numpy()
 
     if features:
-        X = df[[features]]
+        X = df[utils.normalize_columns_args(features)]
     elif drop:
-        X = df.drop(columns=drop)
+        drop = [target] + utils.normalize_columns_args(drop)
+        X = df.drop(columns=drop, errors="ignore")
     else:
         X = df.drop(columns=[target])
 
+    # Sparse mode encodes non-numeric columns straight into CSR and also
+    # returns the feature names: (X, y, names)
+    if sparse:
+        X, names = _to_sparse(X, encode)
+        return X, y, names
+
     if as_numpy:
         X = X.to_numpy()
 
@@ -32,7 +437,9 @@ def to_xy(df: pd.DataFrame, target, features=None, drop=None, as_numpy=True):
 
 
 def to_torch(df: pd.DataFrame, target, features=None, drop=None):
-    X, y = to_xy(df, target, features=None, drop=None)
+    import torch
+
+    X, y = to_xy(df, target, features=features, drop=drop)
     X_t = torch.from_numpy(X)
     y_t = torch.from_numpy(y)
 
@@ -47,6 +454,8 @@ def to_dtm(
     target_col: str | None = None,
     top_n_terms: int | None = None,
 ) -> pd.DataFrame:
+    from scipy.sparse import csr_matrix
+
     if weight_col is None:
         df_agg = df.groupby([doc_col, term_col]).size().reset_index(name="__weight__")
     else:
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Sequence
 
+import numpy as np
 import pandas as pd
 
 from . import utils
 
 
-def filter(df: pd.DataFrame, fn, groupby=None) -> pd.DataFrame:
+def filter(df: pd.DataFrame, fn, groupby=None, schema=None) -> pd.DataFrame:
     if isinstance(fn, str):
-        fn = utils.compile_expr(fn)
+        fn = utils.compile_expr(fn, utils.caller_globals())
 
-    grouped = utils.make_groups(df, groupby, to_iter=True)
+    grouped = utils.make_groups(df, groupby, to_iter=True, schema=schema)
 
     out = []
     for _, group_df in grouped:
@@ -19,7 +20,7 @@ def filter(df: pd.DataFrame, fn, groupby=None) -> pd.DataFrame:
         group_df = group_df.pipe(lambda g: g[fn(g)])
         out.append(group_df)
 
-    return pd.concat(out)
+    return utils.concat_frames(out)
 
 
 def omit_na(df: pd.DataFrame) -> pd.DataFrame:
@@ -35,18 +36,165 @@ def arrange(df: pd.DataFrame, *cols: str | Iterable[str]) -> pd.DataFrame:
     return df.sort_values(norm_cols, ascending=ascending).reset_index(drop=True)
 
 
-def slice_head(df: pd.DataFrame, n: int, groupby=None) -> pd.DataFrame:
-    grouped = utils.make_groups(df, groupby)
+def slice_head(df: pd.DataFrame, n: int, groupby=None, schema=None) -> pd.DataFrame:
+    grouped = utils.make_groups(df, groupby, schema=schema)
     return grouped.head(n).reset_index(drop=True)
 
 
-def slice_tail(df: pd.DataFrame, n: int, groupby=None) -> pd.DataFrame:
-    grouped = utils.make_groups(df, groupby)
+def slice_tail(df: pd.DataFrame, n: int, groupby=None, schema=None) -> pd.DataFrame:
+    grouped = utils.make_groups(df, groupby, schema=schema)
     return grouped.tail(n).reset_index(drop=True)
 
 
+def _sample_keys(
+    rng: np.random.Generator, df: pd.DataFrame, weight: str | None
+) -> np.ndarray:
+    # Efraimidis-Spirakis keys: the n largest of log(u) / w are a weighted
+    # sample without replacement, and the rule is mergeable across chunks
+    u = rng.random(len(df))
+    if weight is None:
+        return u
+
+    w = df[weight].to_numpy(dtype=np.float64)
+    keys = np.full(len(df), -np.inf)
+    positive = w > 0
+    keys[positive] = np.log(u[positive]) / w[positive]
+    return keys
+
+
+def _group_codes(df: pd.DataFrame, group_cols: Sequence[str]) -> np.ndarray:
+    if not group_cols:
+        return np.zeros(len(df), dtype=np.intp)
+
+    missing = [c for c in group_cols if c not in df.columns]
+    if missing:
+        raise KeyError(f"grouping columns not found: {missing}")
+
+    if len(group_cols) == 1:
+        codes, _ = pd.factorize(df[group_cols[0]], sort=True)
+    else:
+        codes, _ = pd.factorize(pd.MultiIndex.from_frame(df[group_cols]), sort=True)
+    return codes
+
+
+def _top_per_group(
+    keys: np.ndarray,
+    codes: np.ndarray,
+    n: int | None = None,
+    frac: float | None = None,
+) -> np.ndarray:
+    # Positions of the largest keys in each group, ordered by group then key
+    order = np.lexsort((-keys, codes))
+    order = order[(codes[order] >= 0) & (keys[order] > -np.inf)]
+    sorted_codes = codes[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_codes, sorted_codes)
+
+    if n is not None:
+        limit = n
+    else:
+        sizes = np.bincount(sorted_codes, minlength=codes.max(initial=-1) + 1)
+        limit = np.round(frac * sizes).astype(np.int64)[sorted_codes]
+
+    return order[rank < limit]
+
+
 def slice_sample(
-    df: pd.DataFrame, n: int | None = None, frac: float | None = None, groupby=None
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    n: int | None = None,
+    frac: float | None = None,
+    groupby=None,
+    weight: str | None = None,
+    seed: int | np.random.Generator | None = None,
+) -> pd.DataFrame:
+    if n is not None and frac is not None:
+        raise ValueError("slice_sample: supply either `n` or `frac`, not both.")
+    if n is None and frac is None:
+        n = 1
+
+    group_cols = utils.normalize_columns_args(groupby) if groupby else []
+    rng = np.random.default_rng(seed)
+
+    if isinstance(df, pd.DataFrame):
+        keys = _sample_keys(rng, df, weight)
+        rows = _top_per_group(keys, _group_codes(df, group_cols), n, frac)
+        return df.iloc[rows].reset_index(drop=True)
+
+    # Chunked input: with `n`, keep a per-group reservoir of the rows with
+    # the largest keys seen so far; with `frac`, keep each row independently
+    if frac is not None and weight is not None:
+        raise ValueError("slice_sample: weighted streaming samples require `n`.")
+
+    kept, kept_keys = [], np.empty(0)
+    for chunk in df:
+        chunk = chunk._df if hasattr(chunk, "_df") else chunk
+        if frac is not None:
+            codes = _group_codes(chunk, group_cols)
+            kept.append(chunk[(rng.random(len(chunk)) < frac) & (codes >= 0)])
+            continue
+
+        keys = _sample_keys(rng, chunk, weight)
+        rows = _top_per_group(keys, _group_codes(chunk, group_cols), n)
+        candidates = utils.concat_frames(kept + [chunk.iloc[rows]])
+        keys = np.concatenate([kept_keys, keys[rows]])
+
+        rows = _top_per_group(keys, _group_codes(candidates, group_cols), n)
+        kept, kept_keys = [candidates.iloc[rows]], keys[rows]
+
+    return utils.concat_frames(kept).reset_index(drop=True)
+
+
+def _distinct_rows(df: pd.DataFrame, keys: Sequence[str], keep) -> np.ndarray:
+    # Positions of the kept rows, in their original order; missing values
+    # form a key of their own
+    rows, ids, n_groups = utils.key_codes(df, keys)
+    if keep == "first":
+        kept = utils.first_rows(rows, ids, n_groups)
+    elif keep == "last":
+        kept = np.empty(n_groups, dtype=np.intp)
+        kept[ids] = rows
+    elif keep is False:
+        return rows[np.bincount(ids, minlength=n_groups)[ids] == 1]
+    else:
+        raise ValueError("distinct: `keep` must be 'first', 'last' or False.")
+    return np.sort(kept)
+
+
+def distinct(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    *cols: str | Iterable[str],
+    keep="first",
+    keep_all: bool = False,
 ) -> pd.DataFrame:
-    grouped = utils.make_groups(df, groupby)
-    return grouped.sample(n=n, frac=frac).reset_index(drop=True)
+    keys = utils.normalize_columns_args(*cols) if cols else None
+
+    if isinstance(df, pd.DataFrame):
+        keys = keys or list(df.columns)
+        out = df if keep_all or not cols else df[keys]
+        return out.take(_distinct_rows(df, keys, keep)).reset_index(drop=True)
+
+    # Chunked input: keep the distinct keys seen so far and drop every chunk
+    # row whose key is among them
+    if keep != "first":
+        raise ValueError("distinct: chunked input only supports keep='first'.")
+
+    kept, seen = [], None
+    for chunk in df:
+        chunk = chunk._df if hasattr(chunk, "_df") else chunk
+        keys = keys or list(chunk.columns)
+        part = chunk if keep_all or not cols else chunk[keys]
+        part = part.take(_distinct_rows(chunk, keys, "first"))
+
+        if seen is not None:
+            both = utils.concat_frames([seen, part[keys]])
+            _, ids, n_groups = utils.key_codes(both, keys)
+            old = np.zeros(n_groups, dtype=bool)
+            old[ids[: len(seen)]] = True
+            part = part[~old[ids[len(seen) :]]]
+            seen = utils.concat_frames([seen, part[keys]])
+        else:
+            seen = part[keys]
+        kept.append(part)
+
+    if not kept:
+        raise ValueError("distinct: no chunks supplied")
+    return utils.concat_frames(kept).reset_index(drop=True)
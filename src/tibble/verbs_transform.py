@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import inspect
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 
+import numpy as np
 import pandas as pd
 
 from . import utils
@@ -14,8 +14,7 @@ def mutate(
     **new_cols: Any,
 ) -> pd.DataFrame:
     # Capture caller's globals to make their imported functions available
-    caller_frame = inspect.currentframe().f_back.f_back
-    caller_globals = caller_frame.f_globals if caller_frame else None
+    caller_globals = utils.caller_globals()
 
     grouped = utils.make_groups(df, groupby, to_iter=True)
 
@@ -30,7 +29,7 @@ def mutate(
 
         out.append(group_df)
 
-    return pd.concat(out)
+    return utils.concat_frames(out)
 
 
 def summarize(
@@ -39,8 +38,7 @@ def summarize(
     **metrics: Any,
 ) -> pd.DataFrame:
     # Capture caller's globals to make their imported functions available
-    caller_frame = inspect.currentframe().f_back.f_back
-    caller_globals = caller_frame.f_globals if caller_frame else None
+    caller_globals = utils.caller_globals()
 
     for key, value in metrics.items():
         if isinstance(value, str):
@@ -64,20 +62,161 @@ def summarize(
         metrics_df = metrics_series.apply(lambda f: f(group_df)).to_frame().T
         out.append(key_df.join(metrics_df))
 
-    return pd.concat(out)
+    return utils.concat_frames(out)
 
 
-def table(df: pd.DataFrame, row: str = None, col: str = None):
-    if row and col:
-        res = pd.crosstab(df[row], df[col])
-        res = res.reset_index(names=row)
-        res.columns.name = None
-    elif row:
-        res = df.value_counts(row).reset_index()
-    elif col:
-        res = df.value_counts(col).to_frame().T
-        res.columns.name = None
+def _count_cells(
+    df: pd.DataFrame, keys: Sequence[str], weight: str | None = None
+) -> pd.DataFrame:
+    # Count combined factorized key codes with bincount; rows with a missing
+    # key are dropped like crosstab
+    missing = [c for c in list(keys) + ([weight] if weight else []) if c not in df]
+    if missing:
+        raise KeyError(f"table: columns not found: {missing}")
+
+    rows, dense, n_cells = utils.key_codes(df, keys, dropna=True)
+    w = df[weight].fillna(0).to_numpy(dtype=np.float64)[rows] if weight else None
+    counts = np.bincount(dense, weights=w, minlength=n_cells)
+
+    # Read each cell's key values off its first row, which keeps key dtypes
+    first = utils.first_rows(rows, dense, n_cells)
+    out = {k: df[k].take(first).reset_index(drop=True) for k in keys}
+    out[weight or "count"] = counts if weight else counts.astype(np.int64)
+
+    return pd.DataFrame(out)
+
+
+def _merge_cells(cells: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    value = [c for c in cells.columns if c not in keys][0]
+    merged = _count_cells(cells, keys, weight=value)
+    if cells[value].dtype.kind in "iu":
+        merged[value] = merged[value].astype(np.int64)
+    return merged
+
+
+def _count_keys(
+    df: pd.DataFrame, keys: Sequence[str], weight: str | None, name: str
+) -> pd.DataFrame:
+    # Like _count_cells, but missing keys count as a group of their own and
+    # groups come out in order of first appearance
+    if weight is not None and weight not in df.columns:
+        raise KeyError(f"count: columns not found: {[weight]}")
+
+    w = df[weight].fillna(0).to_numpy(dtype=np.float64) if weight else None
+    if not keys:
+        return pd.DataFrame({name: [w.sum() if weight else len(df)]})
+
+    rows, ids, n_groups = utils.key_codes(df, keys)
+    counts = np.bincount(ids, weights=w, minlength=n_groups)
+
+    first = np.sort(utils.first_rows(rows, ids, n_groups))
+    out = {k: df[k].take(first).reset_index(drop=True) for k in keys}
+    ids = ids[first]
+    out[name] = counts[ids] if weight else counts[ids].astype(np.int64)
+    return pd.DataFrame(out)
+
+
+def count(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    *cols: str | Iterable[str],
+    sort: bool = False,
+    weight: str | None = None,
+    name: str = "n",
+) -> pd.DataFrame:
+    keys = utils.normalize_columns_args(*cols) if cols else []
+    if name in keys:
+        raise ValueError(f"count: `name` {name!r} clashes with a key column.")
+
+    if isinstance(df, pd.DataFrame):
+        res = _count_keys(df, keys, weight, name)
     else:
+        # Chunked input: fold per-chunk counts into a running total
+        res = None
+        for chunk in df:
+            chunk = chunk._df if hasattr(chunk, "_df") else chunk
+            part = _count_keys(chunk, keys, weight, name)
+            if res is not None:
+                merged = _count_keys(
+                    utils.concat_frames([res, part]), keys, weight=name, name=name
+                )
+                if part[name].dtype.kind in "iu":
+                    merged[name] = merged[name].astype(np.int64)
+                part = merged
+            res = part
+        if res is None:
+            raise ValueError("count: no chunks supplied")
+
+    if sort:
+        res = res.sort_values(name, ascending=False, kind="stable")
+    return res.reset_index(drop=True)
+
+
+def table(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    row: str | Sequence[str] = None,
+    col: str | Sequence[str] = None,
+    weight: str | None = None,
+    sparse: bool = False,
+):
+    if not row and not col:
         raise TypeError("Must supply at least on ot 'col' or 'row' to table().")
 
+    row_keys = utils.normalize_columns_args(row) if row else []
+    col_keys = utils.normalize_columns_args(col) if col else []
+    keys = row_keys + col_keys
+
+    if isinstance(df, pd.DataFrame):
+        cells = _count_cells(df, keys, weight)
+    else:
+        # Chunked input: fold per-chunk cell counts into a running total
+        cells = None
+        for chunk in df:
+            chunk = chunk._df if hasattr(chunk, "_df") else chunk
+            part = _count_cells(chunk, keys, weight)
+            cells = (
+                part
+                if cells is None
+                else _merge_cells(pd.concat([cells, part], ignore_index=True), keys)
+            )
+        if cells is None:
+            raise ValueError("table: no chunks supplied")
+
+    value = weight or "count"
+
+    if sparse:
+        res = cells.sort_values(keys).reset_index(drop=True)
+    elif not col_keys:
+        res = cells.sort_values(value, ascending=False, kind="stable")
+        res = res.reset_index(drop=True)
+    elif not row_keys:
+        res = cells.sort_values(value, ascending=False, kind="stable")
+        labels = (
+            pd.MultiIndex.from_frame(res[col_keys])
+            if len(col_keys) > 1
+            else pd.Index(res[col_keys[0]])
+        )
+        res = pd.DataFrame([res[value].to_numpy()], columns=labels, index=[value])
+        res.columns.name = None
+    else:
+        rows = cells[row_keys]
+        cols = cells[col_keys]
+        rows = pd.MultiIndex.from_frame(rows) if len(row_keys) > 1 else rows.iloc[:, 0]
+        cols = pd.MultiIndex.from_frame(cols) if len(col_keys) > 1 else cols.iloc[:, 0]
+        row_codes, row_labels = pd.factorize(rows, sort=True)
+        col_codes, col_labels = pd.factorize(cols, sort=True)
+
+        mat = np.zeros((len(row_labels), len(col_labels)), cells[value].dtype)
+        mat[row_codes, col_codes] = cells[value].to_numpy()
+
+        res = pd.DataFrame(mat, columns=col_labels)
+        res.columns.name = None
+        row_labels = pd.MultiIndex.from_arrays(
+            [row_labels]
+            if len(row_keys) == 1
+            else [row_labels.get_level_values(i) for i in range(len(row_keys))],
+            names=row_keys,
+        )
+        res.index = row_labels
+        res = res.reset_index()
+
     return res
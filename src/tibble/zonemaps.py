@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import ast
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+
+DEFAULT_BLOCK_SIZE = 65_536
+
+_FLIP = {
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+    ast.Eq: ast.Eq,
+}
+
+
+class ZoneMap:
+    """
+    Per-block min/max of one column. A range filter only evaluates its
+    predicate on blocks whose [min, max] overlaps the range; on data that is
+    clustered by the column (e.g. event logs appended in time order) that is
+    a small fraction of the rows.
+    """
+
+    def __init__(self, values: pd.Series, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.length = len(values)
+        blocks = values.groupby(np.arange(len(values)) // block_size, sort=True)
+        self.mins = blocks.min().reset_index(drop=True)
+        self.maxs = blocks.max().reset_index(drop=True)
+
+    def __repr__(self) -> str:
+        return f"ZoneMap(blocks={len(self.mins)}, block_size={self.block_size})"
+
+    def candidates(self, lo, lo_incl, hi, hi_incl) -> np.ndarray:
+        keep = np.ones(len(self.mins), dtype=bool)
+        # NaN extrema (all-null blocks) compare False, so such blocks drop out
+        if lo is not None:
+            keep &= np.asarray(self.maxs >= lo if lo_incl else self.maxs > lo)
+        if hi is not None:
+            keep &= np.asarray(self.mins <= hi if hi_incl else self.mins < hi)
+
+        starts = np.flatnonzero(keep) * self.block_size
+        stops = np.minimum(starts + self.block_size, self.length)
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)])
+
+
+def _column_ref(node) -> str | None:
+    # `$col` is rewritten to d["col"]
+    if (
+        isinstance(node, ast.Subscript)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "d"
+        and isinstance(node.slice, ast.Constant)
+        and isinstance(node.slice.value, str)
+    ):
+        return node.slice.value
+    return None
+
+
+def _constant(node, caller_globals):
+    if any(isinstance(n, ast.Name) and n.id == "d" for n in ast.walk(node)):
+        raise ValueError("not a constant")
+    value = eval(compile(ast.Expression(node), "<range>", "eval"), caller_globals, {})
+    if value is None or np.ndim(value) != 0:
+        raise ValueError("not a scalar bound")
+    return value
+
+
+def _collect(node, terms: list, caller_globals) -> None:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitAnd):
+        _collect(node.left, terms, caller_globals)
+        _collect(node.right, terms, caller_globals)
+    elif isinstance(node, ast.Compare):
+        operands = [node.left] + node.comparators
+        for a, op, b in zip(operands, node.ops, operands[1:]):
+            if type(op) not in _FLIP:
+                raise ValueError("not a range comparison")
+            col = _column_ref(a)
+            if col is None:
+                col, op, b = _column_ref(b), _FLIP[type(op)](), a
+            if col is None:
+                raise ValueError("comparison without a column")
+            terms.append((col, type(op), _constant(b, caller_globals)))
+    else:
+        raise ValueError("not a range predicate")
+
+
+def parse_range(expr: str, caller_globals=None):
+    """
+    Reduce a filter expression such as "($ts >= a) & ($ts < b)" or
+    "a <= $x < b" to (column, lo, lo_inclusive, hi, hi_inclusive), or None
+    if it is not a conjunction of comparisons of one column with constants.
+    """
+    try:
+        tree = ast.parse(utils.rewrite_expr(expr), mode="eval").body
+        terms = []
+        _collect(tree, terms, caller_globals or {})
+    except Exception:
+        return None
+
+    if len({col for col, _, _ in terms}) != 1:
+        return None
+
+    lo = hi = None
+    lo_incl = hi_incl = True
+    try:
+        for _, op, value in terms:
+            if op in (ast.Gt, ast.GtE, ast.Eq):
+                incl = op is not ast.Gt
+                if lo is None or value > lo or (value == lo and not incl):
+                    lo, lo_incl = value, incl
+            if op in (ast.Lt, ast.LtE, ast.Eq):
+                incl = op is not ast.Lt
+                if hi is None or value < hi or (value == hi and not incl):
+                    hi, hi_incl = value, incl
+    except TypeError:
+        return None
+    return terms[0][0], lo, lo_incl, hi, hi_incl
+
+
+def _rangeable(s: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s)
+
+
+def sorted_bounds(s: pd.Series, lo, lo_incl, hi, hi_incl) -> tuple[int, int]:
+    """Row range of an ascending column (nulls last) within the bounds."""
+    stop = len(s)
+    if stop and pd.isna(s.iat[-1]):
+        # Nulls sort to the end and never satisfy a comparison
+        a, b = 0, stop
+        while a < b:
+            mid = (a + b) // 2
+            if pd.isna(s.iat[mid]):
+                b = mid
+            else:
+                a = mid + 1
+        stop = a
+
+    valid = s.iloc[:stop]
+    start = 0 if lo is None else valid.searchsorted(lo, "left" if lo_incl else "right")
+    end = stop if hi is None else valid.searchsorted(hi, "right" if hi_incl else "left")
+    return int(start), int(max(end, start))
+
+
+def range_filter(tbl, expr: str) -> pd.DataFrame | None:
+    """
+    Answer a single-column range filter by binary search if the column is
+    sorted, or by scanning only overlapping blocks if it has a zone map.
+    Returns None when neither applies and the filter must scan every row.
+    """
+    caller_globals = utils.caller_globals()
+    parsed = parse_range(expr, caller_globals)
+    if parsed is None:
+        return None
+
+    col, lo, lo_incl, hi, hi_incl = parsed
+    df = tbl._df
+    if col not in df.columns or not _rangeable(df[col]):
+        return None
+
+    try:
+        if tbl.is_sorted(col):
+            start, stop = sorted_bounds(df[col], lo, lo_incl, hi, hi_incl)
+            return df.iloc[start:stop].reset_index(drop=True)
+
+        zone_map = tbl._zone_maps.get(col)
+        if zone_map is not None and zone_map.length == len(df):
+            rows = df.iloc[zone_map.candidates(lo, lo_incl, hi, hi_incl)]
+            mask = utils.compile_expr(expr, caller_globals)(rows)
+            return rows[np.asarray(mask, dtype=bool)].reset_index(drop=True)
+    except (TypeError, ValueError):
+        # e.g. a bound that does not compare with the column; let the
+        # full scan raise the usual error
+        return None
+
+    return None
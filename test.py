@@ -1,13 +1,22 @@
+import os
+import sys
+import tempfile
+
 import numpy as np
 import pandas as pd
 
-from tibble import Tibble, concat, read_csv
-
+from tibble import (
+    Tibble, IncrementalSummary, PartitionedTibble, VerbCache, concat, read_csv,
+    slice_sample, approx_distinct, approx_quantile, SharedTibble,
+)
 
 from numpy import (
     min, max, sum, mean, median, quantile, log, sqrt, exp, floor, abs
 )
 
+# heavy output integrations must stay lazy
+assert not {"torch", "plotnine", "scipy"} & set(sys.modules)
+
 n_rows = 1000
 df = Tibble({
     "id": range(n_rows),
@@ -53,6 +62,8 @@ print(df.slice_sample(n=2))
 
 print(df.slice_sample(n=2, groupby="category"))
 
+print(df.slice_sample(n=2, groupby="category", weight="price", seed=0))
+
 
 print(df.mutate(new=lambda d: d["value1"] / d["value2"]))
 
@@ -96,3 +107,154 @@ print(
 )
 
 
+
+
+inc = IncrementalSummary(groupby="category", mu="mean($value1)", sd="std($value1)")
+inc.append(df.slice_head(n=500)).append(df.slice_tail(n=500))
+print(inc.summary())
+
+with VerbCache() as cache:
+    for _ in range(3):
+        df.filter("$value1 > 0").summarize(mu="mean($value2)", groupby="category")
+    print(cache.stats())
+
+with PartitionedTibble([df, df2], by="category", n_partitions=4) as pt:
+    print(pt.summarize(groupby="category", n="len($quantity)"))
+    print(pt.table("category"))
+    print(pt.arrange("category", "-quantity").collect())
+
+print(slice_sample([df, df2], n=3, groupby="category", seed=0))
+
+with tempfile.TemporaryDirectory() as tmp:
+    df.to_csv(os.path.join(tmp, "part-1.csv"))
+    df2.to_csv(os.path.join(tmp, "part-2.csv"))
+    print(read_csv(os.path.join(tmp, "part-*.csv"), source="file"))
+
+print(df.summarize(
+    users="approx_distinct($id)",
+    p99="approx_quantile($price, 0.99)",
+    groupby="category",
+))
+
+# sketch accuracy against the documented error bounds
+rng = np.random.default_rng(0)
+ids = rng.integers(0, 1_000_000, 2_000_000)
+exact = len(np.unique(ids))
+assert abs(approx_distinct(ids) - exact) / exact < 4 * 0.0081
+
+lat = rng.lognormal(size=1_000_000)
+for q in [0.01, 0.5, 0.99, 0.999]:
+    rank = (lat < approx_quantile(lat, q)).mean()
+    assert abs(rank - q) / np.minimum(q, 1 - q) < 0.05, q
+
+# plot pre-aggregation; plotnine itself is optional here
+from tibble.verbs_output import reduce_for_plot  # noqa: E402
+
+walk = pd.DataFrame({"t": pd.date_range("2024", periods=100_000, freq="s")})
+walk["v"] = np.cumsum(rng.normal(size=len(walk)))
+print(reduce_for_plot(walk, {"x": "t", "y": "v"}, "bin", bins=20))
+assert len(reduce_for_plot(walk, {"x": "t", "y": "v"}, "lttb", max_points=500)) == 500
+
+X, y, names = df.to_xy("price", sparse=True)
+print(X.shape, names[:5])
+
+import pickle  # noqa: E402
+
+with SharedTibble(df2._df.astype({"category": "category"})) as shared:
+    ref = pickle.loads(pickle.dumps(shared)).tibble()  # what a worker sees
+    print(df.join_left(ref, on="category").slice_head(n=3))
+
+import gzip  # noqa: E402
+
+with tempfile.TemporaryDirectory() as tmp:
+    df.to_csv(os.path.join(tmp, "out.csv.gz"), chunksize=300)
+    with gzip.open(os.path.join(tmp, "out.csv.gz"), "rt") as f:
+        assert f.read() == df._df.to_csv(index=False)
+
+by_price = df.arrange("price").zone_map("quantity")
+lo_price = 100
+assert by_price.is_sorted("price")
+print(by_price.filter("($price >= lo_price) & ($price < 150)"))
+print(by_price.filter("$quantity >= 15"))
+
+from tibble import Pipeline  # noqa: E402
+
+pipe = (
+    Pipeline()
+    .filter("$value1 > 0")
+    .mutate(v=lambda d: d["value2"] * 2)
+    .join_left(df2, on="category")
+    .summarize(groupby="category", n="n()", total="sum($v)")
+)
+print(pipe, list(pipe.run([df.slice_head(n=500), df.slice_tail(n=500)]))[-1])
+
+import tibble  # noqa: E402
+
+print(df.count("category", "category2", sort=True).slice_head(n=3))
+print(df.distinct("category", keep="last", keep_all=True))
+chunks = [df.slice_head(n=500), df.slice_tail(n=500)]
+assert len(tibble.distinct(chunks, "category", "category2")) == len(
+    df.distinct("category", "category2")
+)
+
+narrow = df.select("id", "category", "price").rename(cost="price")
+assert narrow.schema.names == ["id", "category", "cost"]
+assert not narrow.schema["id"].nullable
+for frame in (df, df._df.astype({"category": object})):
+    try:
+        Pipeline().mutate(c2="$category + 1").check(frame)
+        raise AssertionError("type error not caught up front")
+    except TypeError:
+        pass
+try:
+    Pipeline().mutate(v="$value1 * 2").filter("$nope > 0").check(df)
+    raise AssertionError("unknown filter column not caught up front")
+except KeyError:
+    pass
+
+regrouped = (
+    Tibble({"x": [1, 2, 3, 4, 5, 6], "g": list("bababa")})
+    .arrange("x")
+    .filter(lambda d: d.x > 0, groupby="g")
+)
+assert sorted(regrouped.filter("$x >= 4")["x"]) == [4, 5, 6]
+
+with VerbCache():
+    lo_price = 50
+    above_50 = len(df.filter("$price > lo_price"))
+    lo_price = 150
+    assert len(df.filter("$price > lo_price")) < above_50
+
+nan_batch = pd.DataFrame({"g": [1.0, np.nan], "x": [1.0, 2.0]})
+merged = IncrementalSummary(groupby="g", n="n()").append(nan_batch)
+merged.merge(IncrementalSummary(groupby="g", n="n()").append(nan_batch))
+assert merged.summary()["n"].tolist() == [2, 2]
+
+drifted = [
+    pd.DataFrame({"k": [1, 2, 3], "x": [1.0, 2.0, 3.0]}),
+    pd.DataFrame({"k": [1.0, 2.0, np.nan], "x": [1.0, 2.0, 3.0]}),
+]
+with PartitionedTibble(drifted, by="k", n_partitions=8) as pt:
+    assert pt.summarize(groupby="k", n="len($x)")["n"].tolist() == [2, 2, 1]
+    assert sorted(pt.count("k")["n"]) == [1, 1, 2, 2]
+
+with tempfile.TemporaryDirectory() as tmp:
+    bracketed = os.path.join(tmp, "data[1].csv")
+    df2.to_csv(bracketed)
+    assert len(read_csv(bracketed)) == len(df2)
+
+cats = pd.DataFrame({"g": pd.Categorical(["a", "a"], categories=list("abc"))})
+cat_summary = IncrementalSummary(groupby="g", n="n()").append(cats).summary()
+assert cat_summary["n"].tolist() == [2]
+
+with tempfile.TemporaryDirectory() as tmp:
+    zst_path = os.path.join(tmp, "out.csv.zst")
+    try:
+        df.to_csv(zst_path, chunksize=300)
+    except ValueError as e:
+        # Without Python 3.14 or `zstandard`, refuse up front with a hint
+        assert "zstandard" in str(e) and not os.path.exists(zst_path)
+    else:
+        assert os.path.getsize(zst_path) > 0
+
+assert len(df.arrange()) == len(df)